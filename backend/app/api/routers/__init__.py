@@ -5,4 +5,4 @@ from . import recordings
 from . import s3  # Importing the S3 router
 from . import jaas  # Importing the JAAS router
 from . import geolocation  # Importing the geolocation router
-
+from . import jobs  # Importing the background jobs router
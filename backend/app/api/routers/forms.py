@@ -1,16 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import insert, select
-from typing import Dict, Any
+from typing import Dict, Any, List
+from datetime import datetime
+import json
 from pydantic import BaseModel, EmailStr
 
 from app.db.session import get_session
 from app.db import models
-from app.db.schemas import FormIn, FormOut, EmailRequest
-from app.services.pdf import generate_submissions_pdf
-from app.services.emailer import send_email_with_attachment
-from app.services.report import create_report_service
-from fastapi.responses import StreamingResponse
+from app.db.schemas import FormIn, FormOut, EmailRequest, WatermarkAck
+from app.services.pdf_executor import render_submissions_pdf
+from app.services.pdf_stream import stream_submissions_pdf
+from app.services.report import create_report_service, generate_bulk_claim_reports
+from app.core.config import settings
+from app.services.jobs import enqueue_job, job_status
+from app.services.email_outbox import requeue_dead_email
+from app.services.submissions import fetch_submission_rows, get_watermark, acknowledge_watermark, incremental_cutoff, WATERMARK_PDF
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter(prefix="/forms", tags=["forms"])
 
@@ -20,6 +26,11 @@ class ReportGenerationRequest(BaseModel):
     recipient_email: EmailStr
     form_data: Dict[str, Any] = {}
 
+class BulkReportRequest(BaseModel):
+    claim_ids: List[int]
+    recipient_email: EmailStr
+    form_data: Dict[str, Any] = {}
+
 class FormSubmissionRequest(BaseModel):
     session_id: str
     full_name: str
@@ -53,52 +64,74 @@ async def list_forms(session: AsyncSession = Depends(get_session)):
     return items
 
 @router.get("/pdf")
-async def download_pdf(session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(models.FormSubmission))
-    items = result.scalars().all()
-    data = [
-        {
-            "id": x.id,
-            "full_name": x.full_name,
-            "email": x.email,
-            "notes": x.notes,
-            "latitude": x.latitude,
-            "longitude": x.longitude,
-            "geo_accuracy_m": x.geo_accuracy_m,
-            "captured_at": x.captured_at.isoformat(),
-        }
-        for x in items
-    ]
-    pdf_buf = generate_submissions_pdf(data)
-    return StreamingResponse(pdf_buf, media_type="application/pdf",
+async def download_pdf(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    session: AsyncSession = Depends(get_session)
+):
+    """Download the submissions report. since/until filter on captured_at."""
+    data = await fetch_submission_rows(session, since, until)
+    pdf_bytes = await render_submissions_pdf(data)
+    return Response(pdf_bytes, media_type="application/pdf",
+                    headers={"Content-Disposition":"attachment; filename=submissions.pdf"})
+
+@router.post("/pdf/incremental")
+async def download_incremental_pdf(session: AsyncSession = Depends(get_session)):
+    """
+    Download the submissions added since the last acknowledged incremental
+    report, minus the last REPORT_WATERMARK_LAG seconds (204 when there are
+    none). The watermark only moves once the client posts the X-Report-Last-Id
+    header value to /forms/pdf/incremental/ack.
+    """
+    previous_id = (await get_watermark(session, WATERMARK_PDF)).last_id
+    await session.commit()
+    data = await fetch_submission_rows(session, until=incremental_cutoff(), after_id=previous_id)
+    if not data:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    pdf_bytes = await render_submissions_pdf(data)
+    return Response(pdf_bytes, media_type="application/pdf",
+                    headers={"Content-Disposition":"attachment; filename=submissions.pdf",
+                             "X-Report-Last-Id": str(data[-1]["id"])})
+
+@router.post("/pdf/incremental/ack")
+async def acknowledge_incremental_pdf(body: WatermarkAck, session: AsyncSession = Depends(get_session)):
+    """Confirm receipt of an incremental report so the next one starts after it"""
+    try:
+        watermark = await acknowledge_watermark(session, WATERMARK_PDF, body.last_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    await session.commit()
+    return {"ok": True, "last_id": watermark.last_id}
+
+@router.get("/pdf/stream")
+async def stream_pdf(since: datetime | None = None, until: datetime | None = None):
+    """
+    Stream the submissions report page by page, for exports too large to
+    build in memory. since/until filter on captured_at like /forms/pdf.
+    """
+    return StreamingResponse(stream_submissions_pdf(since, until), media_type="application/pdf",
                              headers={"Content-Disposition":"attachment; filename=submissions.pdf"})
 
-@router.post("/send-email")
+@router.post("/send-email", status_code=status.HTTP_202_ACCEPTED)
 async def send_email(body: EmailRequest | None = None, session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(models.FormSubmission))
-    items = result.scalars().all()
-    data = [
-        {
-            "id": x.id,
-            "full_name": x.full_name,
-            "email": x.email,
-            "notes": x.notes,
-            "latitude": x.latitude,
-            "longitude": x.longitude,
-            "geo_accuracy_m": x.geo_accuracy_m,
-            "captured_at": x.captured_at.isoformat(),
-        }
-        for x in items
-    ]
-    pdf_buf = generate_submissions_pdf(data)
-    send_email_with_attachment(
-        subject="Form Submissions Report",
-        body="Please find the attached report.",
-        pdf_bytes=pdf_buf.read(),
-        filename="submissions.pdf",
-        to_override=body.to if body and body.to else None
-    )
-    return {"ok": True}
+    """Queue the submissions report email; poll /jobs/{job_id} for the outcome"""
+    body = body or EmailRequest()
+    if body.incremental and (body.since or body.until):
+        # The watermark would jump past rows outside the range and never report them
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="incremental cannot be combined with since/until"
+        )
+    job_id = await enqueue_job(session, "submissions_email", {
+        "to": body.to,
+        "incremental": body.incremental,
+        "since": body.since.isoformat() if body.since else None,
+        "until": body.until.isoformat() if body.until else None
+    })
+    return {"ok": True, "job_id": job_id}
 
 @router.post("/submit")
 async def submit_form_data(
@@ -154,39 +187,169 @@ async def submit_form_data(
         "message": "Form data submitted successfully"
     }
 
-@router.post("/generate-report")
+@router.post("/generate-report", status_code=status.HTTP_202_ACCEPTED)
 async def generate_claim_report(
     request: ReportGenerationRequest,
     session: AsyncSession = Depends(get_session)
 ):
-    """Generate and send claim verification report"""
+    """Queue a claim verification report; poll /forms/reports/{job_id} for progress"""
     
-    try:
-        report_service = await create_report_service(session)
-        result = await report_service.generate_and_send_claim_report(
-            claim_id=request.claim_id,
-            recipient_email=request.recipient_email,
-            form_data=request.form_data
-        )
-        
-        if result['success']:
-            return result
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=result.get('message', 'Failed to generate report')
-            )
-            
-    except ValueError as e:
+    result = await session.execute(select(models.Claim.id).where(models.Claim.id == request.claim_id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
+            detail=f"Claim with ID {request.claim_id} not found"
         )
+    
+    try:
+        job_id = await enqueue_job(session, "claim_report", {
+            "claim_id": request.claim_id,
+            "recipient_email": request.recipient_email,
+            "form_data": request.form_data
+        })
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
+    
+    return {
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "message": "Claim verification report queued"
+    }
+
+@router.get("/reports/{job_id}")
+async def get_report_status(
+    job_id: str,
+    session: AsyncSession = Depends(get_session)
+):
+    """Get the progress of a queued claim report, plus its S3 URL and email outcome once done"""
+    
+    result = await session.execute(
+        select(models.Job).where(models.Job.id == job_id, models.Job.kind == "claim_report")
+    )
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+    
+    report = job_status(job)
+    outcome = report.pop("result") or {}
+    report.update({
+        "claim_number": outcome.get("claim_number"),
+        "s3_url": outcome.get("s3_url"),
+        "email_message_id": outcome.get("email_message_id"),
+        "email_status": None,
+        "email_sent": False,
+        "email_error": outcome.get("email_error"),
+        "recipient_email": outcome.get("recipient_email"),
+        "verification_status": outcome.get("verification_status"),
+    })
+    
+    # The email itself is delivered by the outbox, so report where it is now
+    if outcome.get("email_message_id"):
+        email = await session.get(models.OutboundEmail, outcome["email_message_id"])
+        if email:
+            report.update({
+                "email_status": email.status,
+                "email_sent": email.status == "sent",
+                "email_error": email.last_error,
+            })
+    return report
+
+@router.get("/emails/{message_id}")
+async def get_email_status(
+    message_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    """Get the delivery status of a queued email"""
+    
+    email = await session.get(models.OutboundEmail, message_id)
+    
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Email not found"
+        )
+    
+    return {
+        "id": email.id,
+        "to_address": email.to_address,
+        "subject": email.subject,
+        "status": email.status,
+        "attempts": email.attempts,
+        "last_error": email.last_error,
+        "digest_id": email.digest_id,
+        "next_attempt_at": email.next_attempt_at,
+        "sent_at": email.sent_at,
+        "created_at": email.created_at
+    }
+
+@router.post("/emails/{message_id}/retry")
+async def retry_email(
+    message_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    """Requeue a dead-lettered email"""
+    
+    if not await requeue_dead_email(session, message_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email not found or not dead-lettered"
+        )
+    
+    return {"success": True, "id": message_id, "status": "queued"}
+
+@router.post("/bulk-report")
+async def generate_bulk_claim_report(
+    request: BulkReportRequest,
+    stream: bool = False
+):
+    """
+    Generate and send reports for many claims at once.
+
+    With ?stream=true the response is NDJSON: one line per claim as it
+    finishes, then a summary line. Otherwise all results come back together.
+    """
+    
+    if not request.claim_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="claim_ids must not be empty"
+        )
+    if len(request.claim_ids) > settings.BULK_REPORT_MAX_CLAIMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_REPORT_MAX_CLAIMS} claims per request"
+        )
+    
+    results = generate_bulk_claim_reports(request.claim_ids, request.recipient_email, request.form_data)
+    total = len(set(request.claim_ids))
+    
+    if stream:
+        async def ndjson():
+            done = succeeded = 0
+            async for result in results:
+                done += 1
+                succeeded += bool(result.get("success"))
+                yield json.dumps({"done": done, "total": total, "result": result}, default=str) + "\n"
+            yield json.dumps({"done": done, "total": total, "succeeded": succeeded, "failed": done - succeeded}) + "\n"
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    items = [result async for result in results]
+    succeeded = sum(1 for result in items if result.get("success"))
+    return {
+        "total": total,
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "results": items
+    }
 
 @router.get("/claim-summary/{claim_id}")
 async def get_claim_summary(
@@ -2,10 +2,7 @@ from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.auth import get_current_user
-import jwt
-import uuid
-import time
-import base64
+from app.services.jaas_tokens import mint_jaas_token, mint_call_tokens
 
 router = APIRouter(prefix="/jaas", tags=["jaas"])
 
@@ -14,53 +11,7 @@ def generate_jwt(user_name: str, user_email: str, room_name: str, avatar_url: st
     Generate a JaaS JWT token using the user's information
     """
     try:
-        # Get the private key and app ID from settings
-        if not settings.JAAS_PRIVATE_KEY or not settings.JAAS_APP_ID or not settings.JAAS_API_KEY_ID:
-            raise ValueError("Missing JaaS configuration. Check JAAS_PRIVATE_KEY, JAAS_APP_ID, and JAAS_API_KEY_ID")
-
-        # Create payload with all required claims
-        now = int(time.time())
-        
-        payload = {
-            "aud": "jitsi",  # Constant audience for JaaS
-            "iss": "chat",   # Our issuer name
-            "sub": settings.JAAS_APP_ID,  # App ID from 8x8
-            "room": room_name,  # Room name
-            "exp": now + 3600,  # 1 hour from now
-            "nbf": now - 10,    # Valid from 10 seconds ago (clock skew)
-            "context": {
-                "user": {
-                    "id": str(uuid.uuid4()),  # Generate unique user ID
-                    "name": user_name,
-                    "email": user_email,
-                    "avatar": avatar_url,
-                    "moderator": True
-                },
-                "features": {
-                    "recording": True,
-                    "livestreaming": True,
-                    "transcription": True,
-                    "outbound-call": True
-                }
-            }
-        }
-
-        # JWT headers
-        headers = {
-            "kid": settings.JAAS_API_KEY_ID,  # API Key ID from 8x8
-            "typ": "JWT",
-            "alg": "RS256"
-        }
-
-        # Generate token with RS256 algorithm
-        token = jwt.encode(
-            payload,
-            base64.b64decode(settings.JAAS_PRIVATE_KEY),  # Decode base64 private key
-            algorithm="RS256",
-            headers=headers
-        )
-
-        return token
+        return mint_jaas_token(room_name, user_name, user_email, avatar_url, moderator=True)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -93,3 +44,30 @@ async def get_jaas_token(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+
+@router.post("/tokens/call")
+async def get_jaas_call_tokens(
+    room: str = Body(..., description="Room name"),
+    patient_name: str = Body("Patient", description="Patient's display name"),
+    moderator_name: str = Body("Doctor", description="Moderator's display name"),
+    current_user=Depends(get_current_user)
+):
+    """Generate the moderator and patient tokens for a room in one call"""
+    try:
+        tokens = mint_call_tokens(room, patient_name, moderator_name)
+        return JSONResponse(content={
+            "moderatorToken": tokens["moderator"],
+            "patientToken": tokens["patient"],
+            "appId": settings.JAAS_APP_ID,
+            "roomName": room
+        })
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
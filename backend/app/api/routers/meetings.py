@@ -3,26 +3,20 @@ from uuid import uuid4
 import os
 from datetime import datetime
 from typing import Optional
-import httpx
-from twilio.rest import Client
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import insert, select, update
 
 from app.core.config import settings
-from app.db.models import Meeting, Claim
+from app.db.models import Meeting, Claim, SmsMessage
 from app.db.session import get_session
-from app.db.schemas import NewRoomOut, VideoCallRequest, VideoCallResponse, VideoCallStatusResponse, SMSSendRequest
+from app.db.schemas import NewRoomOut, VideoCallRequest, VideoCallResponse, VideoCallStatusResponse, SMSSendRequest, SMSStatusResponse
+from app.services.live_ingest import finalize_live_upload
+from app.services.jaas_tokens import mint_jaas_token, mint_call_tokens
+from app.services.room_pool import claim_pooled_room, build_meeting_url
+from app.services.sms import enqueue_sms, twilio_configured
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
-# Twilio client initialization
-def get_twilio_client():
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-    if account_sid and auth_token:
-        return Client(account_sid, auth_token)
-    return None
-
 @router.post("/new-room", response_model=NewRoomOut)
 async def new_room(session: AsyncSession = Depends(get_session)):
     """Create a new Jitsi meeting room (legacy endpoint)"""
@@ -45,10 +39,6 @@ async def create_video_call(
 ):
     """Create a video call session for claim verification"""
     
-    # Generate unique session ID and room name
-    session_id = str(uuid4())
-    room_name = f"claim-{request.claimId}-{uuid4().hex[:8]}"
-    
     # Get claim details if claim ID provided
     claim = None
     if request.claimId and request.claimId != "CLM-2025-8847":  # Skip for demo claim
@@ -61,82 +51,73 @@ async def create_video_call(
                 detail="Claim not found"
             )
     
-    # Build meeting URLs with JWT tokens for 8x8 cloud provider
-    jitsi_domain = os.getenv("JITSI_DOMAIN", "meet.jit.si")
-    # Use HTTPS for public Jitsi, HTTP for local development
-    protocol = "https" if jitsi_domain == "meet.jit.si" else "http"
-    base_url = f"{protocol}://{jitsi_domain}"
-
-    # Generate JWT tokens for moderator and patient
-    moderator_token = ""
-    patient_token = ""
-
-    try:
-        # Get tokens from the JAAS endpoint
-        async with httpx.AsyncClient() as client:
-            # Generate moderator token
-            resp = await client.post(
-                "http://localhost:8000/api/jaas/token",
-                json={
-                    "room": room_name,
-                    "user_name": "Doctor",
-                    "is_moderator": True
-                }
-            )
-            resp.raise_for_status()
-            moderator_data = resp.json()
-            moderator_token = moderator_data["token"]
-
-            # Generate patient token
-            resp = await client.post(
-                "http://localhost:8000/api/jaas/token",
-                json={
-                    "room": room_name,
-                    "user_name": request.patientName or "Patient",
-                    "is_moderator": False
-                }
-            )
-            resp.raise_for_status()
-            patient_data = resp.json()
-            patient_token = patient_data["token"]
-
-    except Exception as e:
-        print(f"Failed to generate JWT tokens: {str(e)}")
-        # Continue without tokens if JWT generation fails
-
-    # Build URLs with JWT tokens
-    if moderator_token:
-        moderator_url = f"{base_url}/{room_name}?jwt={moderator_token}"
+    # Fast path: claim a pre-provisioned room (its moderator token is minted on claim)
+    pooled = await claim_pooled_room(
+        session,
+        claim_id=claim.id if claim else None,
+        patient_name=request.patientName,
+        procedure=request.procedure
+    )
+    
+    if pooled:
+        session_id = pooled.session_id
+        room_name = pooled.room_name
+        moderator_url = pooled.room_url
+        
+        patient_token = ""
+        try:
+            patient_token = mint_jaas_token(room_name, request.patientName or "Patient", moderator=False)
+        except Exception as e:
+            print(f"Failed to generate JWT tokens: {str(e)}")
+        patient_url = build_meeting_url(room_name, patient_token)
+        
+        await session.execute(
+            update(Meeting).where(Meeting.id == pooled.id).values(patient_url=patient_url)
+        )
+        await session.commit()
     else:
-        moderator_url = f"{base_url}/{room_name}"
+        # Pool empty (or disabled): create the room inline
+        session_id = str(uuid4())
+        room_name = f"claim-{request.claimId}-{uuid4().hex[:8]}"
+        
+        # Generate JWT tokens for moderator and patient
+        moderator_token = ""
+        patient_token = ""
 
-    if patient_token:
-        patient_url = f"{base_url}/{room_name}?jwt={patient_token}"
-    else:
-        patient_url = f"{base_url}/{room_name}"
+        try:
+            # Mint both tokens in-process (the RSA key is parsed once per process)
+            tokens = mint_call_tokens(room_name, request.patientName or "Patient")
+            moderator_token = tokens["moderator"]
+            patient_token = tokens["patient"]
+        except Exception as e:
+            print(f"Failed to generate JWT tokens: {str(e)}")
+            # Continue without tokens if JWT generation fails
 
-    # Create meeting record
-    stmt = insert(Meeting).values(
-        room_name=room_name,
-        session_id=session_id,
-        claim_id=claim.id if claim else None,
-        patient_name=request.patientName,
-        procedure=request.procedure,
-        status="pending",
-        patient_url=patient_url,
-        room_url=moderator_url
-    ).returning(Meeting.id)
+        # Build meeting URLs with JWT tokens for 8x8 cloud provider
+        moderator_url = build_meeting_url(room_name, moderator_token)
+        patient_url = build_meeting_url(room_name, patient_token)
 
-    result = await session.execute(stmt)
-    meeting_id = result.scalar_one()
-    await session.commit()
+        # Create meeting record
+        stmt = insert(Meeting).values(
+            room_name=room_name,
+            session_id=session_id,
+            claim_id=claim.id if claim else None,
+            patient_name=request.patientName,
+            procedure=request.procedure,
+            status="pending",
+            patient_url=patient_url,
+            room_url=moderator_url
+        ).returning(Meeting.id)
+
+        await session.execute(stmt)
+        await session.commit()
     
     # Send SMS to patient if phone number available from claim
     sms_sent = False
+    sms_message_id = None
     if claim and claim.patient_mobile:
         try:
-            twilio_client = get_twilio_client()
-            if twilio_client:
+            if twilio_configured():
                 message_body = f"""
 VerifyCall Video Verification
 
@@ -156,15 +137,9 @@ Thank you,
 VerifyCall Team
                 """.strip()
                 
-                twilio_phone = os.getenv("TWILIO_PHONE_NUMBER", "+1234567890")
-                
-                message = twilio_client.messages.create(
-                    body=message_body,
-                    from_=twilio_phone,
-                    to=claim.patient_mobile
-                )
+                # Queued for the background dispatcher; the response doesn't wait on Twilio
+                sms_message_id = await enqueue_sms(session, claim.patient_mobile, message_body, claim_id=claim.id)
                 sms_sent = True
-                print(f"SMS sent successfully: {message.sid}")
         except Exception as e:
             print(f"Failed to send SMS: {str(e)}")
             # Don't fail the API call if SMS fails
@@ -176,6 +151,7 @@ VerifyCall Team
         roomUrl=moderator_url,
         patientUrl=patient_url,
         smsSent=sms_sent,
+        smsMessageId=sms_message_id,
         message="Video call session created successfully"
     )
 
@@ -234,7 +210,18 @@ async def complete_video_call(
     )
     await session.commit()
     
-    return {"message": "Video call marked as completed", "sessionId": session_id}
+    # Close out the recording streamed in during the call (if any)
+    recording = None
+    try:
+        recording = await finalize_live_upload(session, meeting)
+    except Exception as e:
+        print(f"Failed to finalize live recording: {str(e)}")
+    
+    return {
+        "message": "Video call marked as completed",
+        "sessionId": session_id,
+        "recording": recording
+    }
 
 @router.post("/video-call/start/{session_id}")
 async def start_video_call(
@@ -266,26 +253,36 @@ async def start_video_call(
 
 @router.post("/send-sms")
 async def send_sms(
-    request: SMSSendRequest
+    request: SMSSendRequest,
+    session: AsyncSession = Depends(get_session)
 ):
-    """Send SMS message to patient"""
+    """Queue an SMS message to the patient; poll /meetings/sms/{message_id} for delivery status"""
     
     try:
-        twilio_client = get_twilio_client()
-        if not twilio_client:
+        if not twilio_configured():
             return {"success": False, "message": "Twilio not configured"}
         
-        twilio_phone = os.getenv("TWILIO_PHONE_NUMBER", "+1234567890")
-        
-        message = twilio_client.messages.create(
-            body=request.message,
-            from_=twilio_phone,
-            to=request.phone_number
-        )
-        
-        print(f"SMS sent successfully: {message.sid}")
-        return {"success": True, "message": "SMS sent successfully", "message_id": message.sid}
+        message_id = await enqueue_sms(session, request.phone_number, request.message)
+        return {"success": True, "message": "SMS queued for delivery", "message_id": message_id}
         
     except Exception as e:
-        print(f"Failed to send SMS: {str(e)}")
+        print(f"Failed to queue SMS: {str(e)}")
         return {"success": False, "message": f"Failed to send SMS: {str(e)}"}
+
+@router.get("/sms/{message_id}", response_model=SMSStatusResponse)
+async def get_sms_status(
+    message_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    """Get the delivery status of a queued SMS message"""
+    
+    result = await session.execute(select(SmsMessage).where(SmsMessage.id == message_id))
+    message = result.scalar_one_or_none()
+    
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="SMS message not found"
+        )
+    
+    return message
@@ -1,14 +1,53 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
 from typing import Optional
+from datetime import datetime
+from uuid import uuid4
+import math
 import os
 
 from app.db.session import get_session
 from app.db import models
-from app.services.s3 import get_s3, s3_key_for_recording, generate_s3_url
+from app.services.s3 import (
+    s3_key_for_recording,
+    generate_s3_url,
+    generate_presigned_put_url,
+    generate_presigned_part_urls,
+    check_s3_object_exists,
+    sign_upload_token,
+    verify_upload_token,
+)
+from app.services.s3_multipart import (
+    MAX_PARTS,
+    stream_upload_to_s3,
+    ensure_bucket_ready_async,
+    multipart_part_size,
+    create_multipart_upload,
+    upload_part,
+    complete_multipart_upload,
+    abort_multipart_upload,
+    run_in_s3_executor,
+)
+from app.services.resumable_uploads import (
+    ChunkTooLargeError,
+    read_chunk,
+    expected_part_count,
+    expected_part_size,
+    upload_status,
+)
+from app.services.live_ingest import open_live_upload, append_segment
+from app.services.jobs import enqueue_job, wake_job_workers
 from app.core.config import settings
-from app.db.schemas import RecordingWebhookRequest, RecordingResponse
+from app.db.schemas import (
+    RecordingWebhookRequest,
+    RecordingResponse,
+    RecordingPresignRequest,
+    RecordingUploadCompleteRequest,
+    ResumableUploadCreate,
+    ResumableUploadComplete,
+)
 
 router = APIRouter(prefix="/recordings", tags=["recordings"])
 
@@ -42,7 +81,6 @@ async def upload_recording(
         )
 
     # Generate S3 key and upload
-    s3 = get_s3()
     key = s3_key_for_recording(file.filename)
     
     if not settings.S3_BUCKET:
@@ -52,24 +90,18 @@ async def upload_recording(
         )
 
     try:
-        # Upload to S3
-        s3.upload_fileobj(
-            file.file, 
-            settings.S3_BUCKET, 
-            key, 
-            ExtraArgs={
-                "ContentType": file.content_type or "video/mp4",
-                "Metadata": {
-                    "room_name": room_name,
-                    "meeting_id": str(meeting.id),
-                    "uploaded_by": "verifycall_system"
-                }
+        # Stream to S3 as multipart parts on the S3 executor (keeps the event loop free)
+        s3_url = await stream_upload_to_s3(
+            file,
+            key,
+            content_type=file.content_type or "video/mp4",
+            metadata={
+                "room_name": room_name,
+                "meeting_id": str(meeting.id),
+                "uploaded_by": "verifycall_system"
             }
         )
         
-        # Generate public URL
-        s3_url = generate_s3_url(key)
-        
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -100,6 +132,528 @@ async def upload_recording(
         "message": "Recording uploaded successfully"
     }
 
+@router.post("/presign")
+async def presign_recording_upload(
+    request: RecordingPresignRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Issue presigned URLs so the browser uploads a recording straight to S3.
+
+    Files up to one part are uploaded with a single presigned PUT; larger ones
+    (per size_bytes) get a multipart upload with one presigned URL per part.
+    The client then calls /recordings/presign/complete to register the recording.
+    """
+    
+    result = await session.execute(select(models.Meeting).where(models.Meeting.room_name == request.room_name))
+    meeting = result.scalar_one_or_none()
+
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found for the given room name"
+        )
+
+    if not settings.S3_BUCKET:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="S3 bucket not configured"
+        )
+
+    key = s3_key_for_recording(request.filename)
+    content_type = request.content_type or "video/mp4"
+    part_size = multipart_part_size()
+
+    try:
+        await ensure_bucket_ready_async()
+
+        if request.size_bytes and request.size_bytes > part_size:
+            part_count = math.ceil(request.size_bytes / part_size)
+            if part_count > MAX_PARTS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File is too large for the configured part size"
+                )
+
+            upload_id = await create_multipart_upload(
+                key,
+                content_type,
+                metadata={
+                    "room_name": request.room_name,
+                    "meeting_id": str(meeting.id),
+                    "uploaded_by": "verifycall_system"
+                }
+            )
+            return {
+                "method": "multipart",
+                "s3_key": key,
+                "upload_id": upload_id,
+                "part_size": part_size,
+                "parts": generate_presigned_part_urls(key, upload_id, part_count),
+                "upload_token": sign_upload_token(request.room_name, key, upload_id),
+                "expires_in": settings.S3_PRESIGN_UPLOAD_EXPIRY
+            }
+
+        return {
+            "method": "PUT",
+            "s3_key": key,
+            "url": generate_presigned_put_url(key, content_type),
+            "content_type": content_type,
+            "upload_token": sign_upload_token(request.room_name, key, ""),
+            "expires_in": settings.S3_PRESIGN_UPLOAD_EXPIRY
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to prepare upload: {str(e)}"
+        )
+
+@router.post("/presign/complete")
+async def complete_recording_upload(
+    request: RecordingUploadCompleteRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """Finish a direct-to-S3 upload and store the recording metadata"""
+    
+    if not verify_upload_token(request.upload_token, request.room_name, request.s3_key, request.upload_id or ""):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid upload token"
+        )
+
+    result = await session.execute(select(models.Meeting).where(models.Meeting.room_name == request.room_name))
+    meeting = result.scalar_one_or_none()
+
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found for the given room name"
+        )
+
+    # Completion callbacks may be retried by the browser; don't record twice
+    result = await session.execute(
+        select(models.Recording).where(models.Recording.s3_key == request.s3_key)
+    )
+    existing = result.scalars().first()
+    if existing:
+        return {
+            "success": True,
+            "recording_id": existing.id,
+            "s3_key": existing.s3_key,
+            "s3_url": existing.s3_url,
+            "message": "Recording already registered"
+        }
+
+    try:
+        if request.upload_id:
+            if not request.parts:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Parts are required to complete a multipart upload"
+                )
+            await complete_multipart_upload(
+                request.s3_key,
+                request.upload_id,
+                [{"PartNumber": p.part_number, "ETag": p.etag} for p in request.parts]
+            )
+        elif not await run_in_s3_executor(check_s3_object_exists, request.s3_key):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded object not found in S3"
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to complete upload: {str(e)}"
+        )
+
+    s3_url = generate_s3_url(request.s3_key)
+    stmt = insert(models.Recording).values(
+        meeting_id=meeting.id,
+        s3_key=request.s3_key,
+        s3_url=s3_url,
+        mime_type=request.mime_type or "video/mp4",
+        duration_sec=request.duration_sec,
+        latitude=request.latitude,
+        longitude=request.longitude,
+        geo_accuracy_m=request.geo_accuracy_m,
+    ).returning(models.Recording.id)
+    
+    result = await session.execute(stmt)
+    new_recording_id = result.scalar_one()
+    await session.commit()
+
+    return {
+        "success": True,
+        "recording_id": new_recording_id,
+        "s3_key": request.s3_key,
+        "s3_url": s3_url,
+        "message": "Recording uploaded successfully"
+    }
+
+async def _get_upload_session(session: AsyncSession, upload_session_id: str):
+    result = await session.execute(
+        select(models.UploadSession).where(
+            models.UploadSession.id == upload_session_id,
+            models.UploadSession.kind == "resumable",
+        )
+    )
+    upload = result.scalar_one_or_none()
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    result = await session.execute(
+        select(models.UploadPart).where(models.UploadPart.upload_session_id == upload_session_id)
+    )
+    return upload, list(result.scalars().all())
+
+@router.post("/uploads", status_code=201)
+async def create_resumable_upload(
+    request: ResumableUploadCreate,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Start a resumable recording upload.
+
+    The client then PUTs numbered chunks of exactly part_size bytes (the last
+    one may be shorter), can query the upload to find out which chunks are
+    missing after a dropped connection, and finally calls complete.
+    """
+    
+    result = await session.execute(select(models.Meeting).where(models.Meeting.room_name == request.room_name))
+    meeting = result.scalar_one_or_none()
+
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found for the given room name"
+        )
+
+    if not settings.S3_BUCKET:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="S3 bucket not configured"
+        )
+
+    part_size = multipart_part_size()
+    if request.size_bytes and math.ceil(request.size_bytes / part_size) > MAX_PARTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is too large for the configured part size"
+        )
+
+    key = s3_key_for_recording(request.filename)
+    content_type = request.content_type or "video/mp4"
+
+    try:
+        await ensure_bucket_ready_async()
+        upload_id = await create_multipart_upload(
+            key,
+            content_type,
+            metadata={
+                "room_name": request.room_name,
+                "meeting_id": str(meeting.id),
+                "uploaded_by": "verifycall_system"
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start upload: {str(e)}"
+        )
+
+    upload = models.UploadSession(
+        id=str(uuid4()),
+        meeting_id=meeting.id,
+        s3_key=key,
+        upload_id=upload_id,
+        mime_type=content_type,
+        part_size=part_size,
+        total_size=request.size_bytes,
+        status="active",
+    )
+    session.add(upload)
+    await session.commit()
+
+    return upload_status(upload, [])
+
+@router.get("/uploads/{upload_session_id}")
+async def get_resumable_upload(
+    upload_session_id: str,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the received offset and missing chunks of a resumable upload"""
+    
+    upload, parts = await _get_upload_session(session, upload_session_id)
+    return upload_status(upload, parts)
+
+@router.put("/uploads/{upload_session_id}/chunks/{part_number}")
+async def put_resumable_upload_chunk(
+    upload_session_id: str,
+    part_number: int,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+):
+    """Upload one numbered chunk (raw request body). Re-sending a chunk replaces it."""
+    
+    upload, parts = await _get_upload_session(session, upload_session_id)
+
+    if upload.status != "active":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload session is {upload.status}"
+        )
+
+    part_count = expected_part_count(upload)
+    if part_number < 1 or part_number > (part_count or MAX_PARTS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid chunk number"
+        )
+
+    try:
+        data = await read_chunk(request, upload.part_size)
+    except ChunkTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+    expected_size = expected_part_size(upload, part_number)
+    if not data or (expected_size is not None and len(data) != expected_size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk {part_number} must be {expected_size or upload.part_size} bytes"
+        )
+
+    try:
+        etag = await upload_part(upload.s3_key, upload.upload_id, part_number, data)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to store chunk: {str(e)}"
+        )
+
+    existing = next((p for p in parts if p.part_number == part_number), None)
+    if existing:
+        existing.etag = etag
+        existing.size = len(data)
+    else:
+        part = models.UploadPart(
+            upload_session_id=upload.id,
+            part_number=part_number,
+            etag=etag,
+            size=len(data),
+        )
+        session.add(part)
+        parts.append(part)
+    # Touch the session so the sweeper treats it as alive
+    upload.updated_at = datetime.utcnow()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # A concurrent PUT of the same chunk recorded its part first
+        await session.rollback()
+        upload, parts = await _get_upload_session(session, upload_session_id)
+        winner = next((p for p in parts if p.part_number == part_number), None)
+        if winner is None or winner.etag != etag:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Chunk {part_number} was uploaded concurrently with different content; re-send it"
+            )
+
+    return upload_status(upload, parts)
+
+@router.post("/uploads/{upload_session_id}/complete")
+async def complete_resumable_upload(
+    upload_session_id: str,
+    request: ResumableUploadComplete,
+    session: AsyncSession = Depends(get_session),
+):
+    """Assemble the received chunks into the final S3 object and store the recording"""
+    
+    upload, parts = await _get_upload_session(session, upload_session_id)
+
+    if upload.status == "completed":
+        result = await session.execute(
+            select(models.Recording).where(models.Recording.s3_key == upload.s3_key)
+        )
+        recording = result.scalars().first()
+        return {
+            "success": True,
+            "recording_id": recording.id if recording else None,
+            "s3_key": upload.s3_key,
+            "s3_url": recording.s3_url if recording else generate_s3_url(upload.s3_key),
+            "message": "Upload already completed"
+        }
+
+    if upload.status != "active":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload session is {upload.status}"
+        )
+
+    ordered = sorted(parts, key=lambda p: p.part_number)
+    status_info = upload_status(upload, parts)
+    if (
+        not ordered
+        or [p.part_number for p in ordered] != list(range(1, len(ordered) + 1))
+        or any(p.size != upload.part_size for p in ordered[:-1])
+        or status_info["missing_parts"]
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Upload is incomplete", **status_info}
+        )
+
+    try:
+        await complete_multipart_upload(
+            upload.s3_key,
+            upload.upload_id,
+            [{"PartNumber": p.part_number, "ETag": p.etag} for p in ordered]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to complete upload: {str(e)}"
+        )
+
+    s3_url = generate_s3_url(upload.s3_key)
+    stmt = insert(models.Recording).values(
+        meeting_id=upload.meeting_id,
+        s3_key=upload.s3_key,
+        s3_url=s3_url,
+        mime_type=upload.mime_type,
+        duration_sec=request.duration_sec,
+        latitude=request.latitude,
+        longitude=request.longitude,
+        geo_accuracy_m=request.geo_accuracy_m,
+    ).returning(models.Recording.id)
+    
+    result = await session.execute(stmt)
+    new_recording_id = result.scalar_one()
+    upload.status = "completed"
+    await session.commit()
+
+    return {
+        "success": True,
+        "recording_id": new_recording_id,
+        "s3_key": upload.s3_key,
+        "s3_url": s3_url,
+        "message": "Recording uploaded successfully"
+    }
+
+@router.delete("/uploads/{upload_session_id}")
+async def abort_resumable_upload(
+    upload_session_id: str,
+    session: AsyncSession = Depends(get_session),
+):
+    """Abandon a resumable upload and discard its chunks"""
+    
+    upload, _ = await _get_upload_session(session, upload_session_id)
+
+    if upload.status == "active":
+        upload.status = "aborted"
+        await session.commit()
+        await abort_multipart_upload(upload.s3_key, upload.upload_id)
+
+    return {"message": "Upload aborted", "upload_session_id": upload_session_id}
+
+@router.post("/live/{room_name}/segments")
+async def ingest_live_segment(
+    room_name: str,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Append a MediaRecorder segment (raw request body) to the room's live recording.
+    The WebSocket endpoint is preferred; this is the fallback for clients without it.
+    """
+    
+    result = await session.execute(select(models.Meeting).where(models.Meeting.room_name == room_name))
+    meeting = result.scalar_one_or_none()
+
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found for the given room name"
+        )
+
+    if not settings.S3_BUCKET:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="S3 bucket not configured"
+        )
+
+    try:
+        data = await read_chunk(request, multipart_part_size())
+    except ChunkTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+    if not data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty segment"
+        )
+
+    try:
+        upload = await open_live_upload(meeting, request.headers.get("content-type") or "video/webm")
+        progress = await append_segment(upload, data)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to store segment: {str(e)}"
+        )
+
+    return {"success": True, "room_name": room_name, **progress}
+
+@router.websocket("/live/{room_name}")
+async def live_recording_stream(
+    websocket: WebSocket,
+    room_name: str,
+    content_type: str = "video/webm",
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Stream MediaRecorder segments as binary WebSocket messages while the call
+    is in progress. Each message is acknowledged with the upload progress; the
+    recording is finalized by /meetings/video-call/complete/{session_id}.
+    """
+    
+    result = await session.execute(select(models.Meeting).where(models.Meeting.room_name == room_name))
+    meeting = result.scalar_one_or_none()
+    # Release the pooled connection for the lifetime of the stream
+    await session.close()
+
+    if not meeting or not settings.S3_BUCKET:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    try:
+        upload = await open_live_upload(meeting, content_type)
+        while True:
+            data = await websocket.receive_bytes()
+            if not data:
+                continue
+            progress = await append_segment(upload, data)
+            await websocket.send_json(progress)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Live ingest failed for room {room_name}: {str(e)}")
+        await websocket.close(code=1011)
+
 @router.post("/webhook/jitsi")
 async def jitsi_recording_webhook(
     webhook_data: RecordingWebhookRequest,
@@ -198,7 +752,7 @@ async def get_recording(
     
     return recording
 
-@router.delete("/{recording_id}")
+@router.delete("/{recording_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_recording(
     recording_id: int,
     session: AsyncSession = Depends(get_session)
@@ -217,19 +771,17 @@ async def delete_recording(
             detail="Recording not found"
         )
     
-    # Delete from S3 if key exists
-    if recording.s3_key and settings.S3_BUCKET:
-        try:
-            s3 = get_s3()
-            s3.delete_object(Bucket=settings.S3_BUCKET, Key=recording.s3_key)
-        except Exception as e:
-            print(f"Failed to delete from S3: {str(e)}")
-            # Continue with database deletion even if S3 deletion fails
-    
     # Delete from database
     await session.execute(
         models.Recording.__table__.delete().where(models.Recording.id == recording_id)
     )
+    
+    # The S3 delete runs on a job worker; poll /jobs/{job_id} for the outcome.
+    # The job commits with the row delete so the object can't be orphaned.
+    job_id = None
+    if recording.s3_key and settings.S3_BUCKET:
+        job_id = await enqueue_job(session, "s3.delete_object", {"bucket": settings.S3_BUCKET, "key": recording.s3_key}, commit=False)
     await session.commit()
+    wake_job_workers()
     
-    return {"message": "Recording deleted successfully"}
+    return {"message": "Recording deleted successfully", "job_id": job_id}
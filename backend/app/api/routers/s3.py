@@ -1,9 +1,10 @@
 import json
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
 from fastapi.responses import JSONResponse
-from app.services.s3 import upload_file_to_s3, s3_key_for_recording, s3_key_for_claim_file, generate_s3_url
-import os
-import tempfile
+from app.services.s3 import s3_key_for_recording, s3_key_for_claim_file, generate_s3_url, generate_presigned_put_url
+from app.services.s3_multipart import ensure_bucket_ready_async, stream_upload_to_s3
+from app.core.config import settings
+from app.db.schemas import ClaimFilePresignRequest
 
 router = APIRouter(prefix="/s3", tags=["s3"])
 
@@ -14,38 +15,59 @@ async def upload_file(file: UploadFile = File(...), claim_id: str = Form(None)):
     If claim_id is provided, files are organized in claim_id folders
     """
     try:
-        # Create a temporary file to store the uploaded content
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
-        try:
-            # Generate S3 key based on whether claim_id is provided
-            if claim_id:
-                s3_key = s3_key_for_claim_file(claim_id, file.filename)
-            else:
-                s3_key = s3_key_for_recording(file.filename)
-            
-            # Upload to S3
-            s3_url = upload_file_to_s3(temp_file_path, s3_key, file.content_type)
-            
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "message": "File uploaded successfully",
-                    "url": s3_url,
-                    "key": s3_key,
-                    "filename": file.filename,
-                    "claim_id": claim_id
-                }
-            )
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+        # Generate S3 key based on whether claim_id is provided
+        if claim_id:
+            s3_key = s3_key_for_claim_file(claim_id, file.filename)
+        else:
+            s3_key = s3_key_for_recording(file.filename)
+        
+        # Stream the spooled upload straight into S3, one part at a time
+        s3_url = await stream_upload_to_s3(file, s3_key, file.content_type)
+        
+        return JSONResponse(
+            status_code=200,
+            content={
+                "message": "File uploaded successfully",
+                "url": s3_url,
+                "key": s3_key,
+                "filename": file.filename,
+                "claim_id": claim_id
+            }
+        )
             
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error uploading file: {str(e)}"
         )
+
+@router.post("/presign")
+async def presign_claim_file_upload(request: ClaimFilePresignRequest):
+    """
+    Issue a presigned PUT URL so the browser uploads a claim file straight to S3.
+    The object lands under the same claim_id folder as /s3/upload would use.
+    """
+    if not settings.S3_BUCKET:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="S3 bucket not configured"
+        )
+
+    try:
+        await ensure_bucket_ready_async()
+        s3_key = s3_key_for_claim_file(request.claim_id, request.filename)
+        return {
+            "method": "PUT",
+            "upload_url": generate_presigned_put_url(s3_key, request.content_type),
+            "content_type": request.content_type,
+            "url": generate_s3_url(s3_key),
+            "key": s3_key,
+            "filename": request.filename,
+            "claim_id": request.claim_id,
+            "expires_in": settings.S3_PRESIGN_UPLOAD_EXPIRY
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error preparing upload: {str(e)}"
+        )
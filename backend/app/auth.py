@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert
-from passlib.context import CryptContext
+from sqlalchemy import select, insert, update
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
@@ -10,9 +9,15 @@ import os
 from app.db.session import get_session
 from app.db.models import User
 from app.db.schemas import UserCreate, UserLogin, UserResponse, AuthResponse
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.passwords import PasswordHasherBusy, hash_password, verify_and_update_password
+from app.services.principal_cache import (
+    token_fingerprint,
+    get_cached_principal,
+    cache_principal,
+    invalidate_user,
+    revoke_token,
+    is_token_revoked,
+)
 
 # JWT settings
 SECRET_KEY = os.getenv("JWT_SECRET", "your-super-secret-jwt-key-change-this")
@@ -22,11 +27,27 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 # Utility functions
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify on the bcrypt pool; also returns a new hash if the stored cost is outdated"""
+    try:
+        return await verify_and_update_password(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"}
+        )
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Hash on the bcrypt pool"""
+    try:
+        return await hash_password(password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"}
+        )
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -48,6 +69,13 @@ async def get_current_user(request: Request, session: AsyncSession = Depends(get
         )
     
     token = auth_header.split(" ")[1]
+    fingerprint = token_fingerprint(token)
+    
+    if is_token_revoked(fingerprint):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
     
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -63,6 +91,11 @@ async def get_current_user(request: Request, session: AsyncSession = Depends(get
             detail="Invalid authentication credentials"
         )
     
+    # Serve repeat requests with the same token from the principal cache
+    cached_user = get_cached_principal(int(user_id), fingerprint)
+    if cached_user is not None:
+        return cached_user
+    
     # Get user from database
     result = await session.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
@@ -73,6 +106,7 @@ async def get_current_user(request: Request, session: AsyncSession = Depends(get
             detail="User not found"
         )
     
+    cache_principal(user.id, fingerprint, user)
     return user
 
 @router.post("/register", response_model=AuthResponse)
@@ -95,7 +129,7 @@ async def register(user: UserCreate, response: Response, session: AsyncSession =
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     stmt = insert(User).values(
         email=user.email,
         password=hashed_password
@@ -137,12 +171,19 @@ async def login(user: UserLogin, response: Response, session: AsyncSession = Dep
         )
     
     # Verify password
-    if not verify_password(user.password, db_user.password):
+    valid, new_hash = await verify_password(user.password, db_user.password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
     
+    # Transparently upgrade hashes made with a different bcrypt cost
+    if new_hash:
+        await session.execute(update(User).where(User.id == db_user.id).values(password=new_hash))
+        await session.commit()
+        invalidate_user(db_user.id)
+    
     # Generate token
     access_token = create_access_token(data={"sub": str(db_user.id)})
     
@@ -163,7 +204,17 @@ async def login(user: UserLogin, response: Response, session: AsyncSession = Dep
     }
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response):
+    # Revoke the presented token so cached principals stop accepting it
+    auth_header = request.headers.get("Authorization")
+    token = auth_header.split(" ")[1] if auth_header and auth_header.startswith("Bearer ") else request.cookies.get("accessToken")
+    if token:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            revoke_token(token_fingerprint(token), float(payload.get("exp", 0)))
+        except JWTError:
+            pass
+    
     response.delete_cookie("accessToken")
     return {"message": "Logged out successfully"}
 
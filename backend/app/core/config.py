@@ -13,10 +13,58 @@ class Settings(BaseSettings):
     # JWT Settings
     jwt_secret: str = os.getenv("JWT_SECRET", "your-super-secret-jwt-key-change-this")
 
+    # Authenticated principal cache
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # seconds, 0 disables
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))  # waiting calls before 503
+
     # Twilio Settings
     twilio_account_sid: str = os.getenv("TWILIO_ACCOUNT_SID", "your-twilio-account-sid")
     twilio_auth_token: str = os.getenv("TWILIO_AUTH_TOKEN", "your-twilio-auth-token")
     twilio_phone_number: str = os.getenv("TWILIO_PHONE_NUMBER", "+1234567890")
+    # Outbound SMS queue
+    SMS_CONCURRENCY: int = int(os.getenv("SMS_CONCURRENCY", "4"))
+    SMS_BATCH_SIZE: int = int(os.getenv("SMS_BATCH_SIZE", "20"))
+    SMS_MAX_ATTEMPTS: int = int(os.getenv("SMS_MAX_ATTEMPTS", "5"))
+    SMS_RETRY_BASE_DELAY: int = int(os.getenv("SMS_RETRY_BASE_DELAY", "5"))  # seconds, doubled per attempt
+    SMS_POLL_INTERVAL: int = int(os.getenv("SMS_POLL_INTERVAL", "5"))  # seconds
+    SMS_SENDING_TIMEOUT: int = int(os.getenv("SMS_SENDING_TIMEOUT", "300"))  # seconds before a stuck send is retried
+
+    # PDF rendering
+    PDF_RENDER_WORKERS: int = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 2)))  # processes
+    PDF_RENDER_MAX_QUEUE: int = int(os.getenv("PDF_RENDER_MAX_QUEUE", "32"))  # waiting renders before callers block
+
+    # Local report copies (reports/)
+    REPORTS_KEEP_LOCAL: bool = os.getenv("REPORTS_KEEP_LOCAL", "true").lower() == "true"  # false also disables the disk report cache
+    REPORTS_RETENTION_DAYS: int = int(os.getenv("REPORTS_RETENTION_DAYS", "7"))  # 0 keeps files regardless of age
+    REPORTS_MAX_BYTES: int = int(os.getenv("REPORTS_MAX_BYTES", str(1024 * 1024 * 1024)))  # 0 means no size cap
+
+    # Incremental submissions reports
+    REPORT_WATERMARK_LAG: int = int(os.getenv("REPORT_WATERMARK_LAG", "60"))  # seconds; newer submissions wait for the next run
+
+    # Streamed submissions report (/forms/pdf/stream)
+    SUBMISSIONS_STREAM_CHUNK: int = int(os.getenv("SUBMISSIONS_STREAM_CHUNK", "500"))  # rows fetched per cursor round trip
+
+    # Claim report cache
+    REPORT_CACHE_DIR: str = os.getenv("REPORT_CACHE_DIR", "reports/cache")
+    REPORT_CACHE_MAX_BYTES: int = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 0 disables the disk cache
+    REPORT_CACHE_S3: bool = os.getenv("REPORT_CACHE_S3", "false").lower() == "true"  # also read cache misses back from {S3_PREFIX}reports/
+
+    # Bulk claim reports
+    BULK_REPORT_MAX_CLAIMS: int = int(os.getenv("BULK_REPORT_MAX_CLAIMS", "500"))
+    BULK_REPORT_BATCH_SIZE: int = int(os.getenv("BULK_REPORT_BATCH_SIZE", "50"))  # claims loaded per query
+    BULK_REPORT_CONCURRENCY: int = int(os.getenv("BULK_REPORT_CONCURRENCY", "8"))  # reports in flight
+
+    # Background jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))  # per process
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BASE_DELAY: int = int(os.getenv("JOB_RETRY_BASE_DELAY", "10"))  # seconds, doubled per attempt
+    JOB_POLL_INTERVAL: int = int(os.getenv("JOB_POLL_INTERVAL", "2"))  # seconds
+    JOB_LOCK_TIMEOUT: int = int(os.getenv("JOB_LOCK_TIMEOUT", "900"))  # seconds before a running job is reclaimed
 
     # Server Settings
     port: str = os.getenv("PORT", "8000")
@@ -27,17 +75,50 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = os.getenv("SMTP_PASSWORD")
     EMAIL_FROM: str | None = os.getenv("EMAIL_FROM")
     EMAIL_TO: str | None = os.getenv("EMAIL_TO")
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", "4"))  # concurrent SMTP sessions per process
+    SMTP_IDLE_TIMEOUT: int = int(os.getenv("SMTP_IDLE_TIMEOUT", "60"))  # seconds before an idle session is dropped
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+    SMTP_TIMEOUT: int = int(os.getenv("SMTP_TIMEOUT", "30"))  # seconds
+    EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", "20"))  # messages claimed per dispatcher pass
+    EMAIL_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))  # then the message is dead-lettered
+    EMAIL_RETRY_BASE_DELAY: int = int(os.getenv("EMAIL_RETRY_BASE_DELAY", "30"))  # seconds, doubled per attempt
+    EMAIL_POLL_INTERVAL: int = int(os.getenv("EMAIL_POLL_INTERVAL", "5"))  # seconds
+    EMAIL_SENDING_TIMEOUT: int = int(os.getenv("EMAIL_SENDING_TIMEOUT", "300"))  # seconds before a stuck send is retried
+    EMAIL_ATTACHMENT_MAX_BYTES: int = int(os.getenv("EMAIL_ATTACHMENT_MAX_BYTES", str(2 * 1024 * 1024)))  # larger PDFs are sent as links; 0 always attaches
+    EMAIL_LINK_EXPIRY: int = int(os.getenv("EMAIL_LINK_EXPIRY", str(7 * 24 * 3600)))  # seconds; SigV4 allows at most 7 days
+    EMAIL_DIGEST_WINDOW: int = int(os.getenv("EMAIL_DIGEST_WINDOW", "60"))  # seconds notifications wait to be coalesced
 
     # JaaS Settings
     JAAS_APP_ID: str = os.getenv("JAAS_APP_ID", "")
     JAAS_API_KEY_ID: str = os.getenv("JAAS_API_KEY_ID", "")
     JAAS_PRIVATE_KEY: str = os.getenv("JAAS_PRIVATE_KEY", "")  # This will be the secret key for HS256
+    JAAS_TOKEN_TTL: int = int(os.getenv("JAAS_TOKEN_TTL", "3600"))  # seconds
+
+    # Pre-provisioned video call rooms
+    ROOM_POOL_SIZE: int = int(os.getenv("ROOM_POOL_SIZE", "20"))  # 0 disables the pool
+    ROOM_POOL_LOW_WATER: int = int(os.getenv("ROOM_POOL_LOW_WATER", "5"))
+    ROOM_POOL_ENTRY_TTL: int = int(os.getenv("ROOM_POOL_ENTRY_TTL", "1800"))  # seconds a reserved room stays claimable
+    ROOM_POOL_REFILL_INTERVAL: int = int(os.getenv("ROOM_POOL_REFILL_INTERVAL", "30"))  # seconds
 
     AWS_ACCESS_KEY_ID: str | None = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY: str | None = os.getenv("AWS_SECRET_ACCESS_KEY")
     AWS_REGION: str | None = os.getenv("AWS_REGION")
     S3_BUCKET: str | None = os.getenv("S3_BUCKET")
     S3_PREFIX: str = os.getenv("S3_PREFIX") or ""
+    # Shared S3 client
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+    S3_RETRY_MODE: str = os.getenv("S3_RETRY_MODE", "adaptive")  # legacy, standard or adaptive
+    S3_MAX_ATTEMPTS: int = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+    S3_TCP_KEEPALIVE: bool = os.getenv("S3_TCP_KEEPALIVE", "true").lower() == "true"
+    S3_BUCKET_CHECK_TTL: int = int(os.getenv("S3_BUCKET_CHECK_TTL", "3600"))  # seconds, <= 0 caches forever
+    S3_PRESIGN_UPLOAD_EXPIRY: int = int(os.getenv("S3_PRESIGN_UPLOAD_EXPIRY", "3600"))  # seconds
+    # Streaming multipart uploads
+    S3_MULTIPART_CHUNK_SIZE: int = int(os.getenv("S3_MULTIPART_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    S3_UPLOAD_CONCURRENCY: int = int(os.getenv("S3_UPLOAD_CONCURRENCY", "4"))  # parts in flight per upload
+    S3_UPLOAD_WORKERS: int = int(os.getenv("S3_UPLOAD_WORKERS", "16"))  # shared executor threads
+    # Resumable recording uploads
+    RESUMABLE_UPLOAD_TTL: int = int(os.getenv("RESUMABLE_UPLOAD_TTL", str(24 * 3600)))  # idle seconds before abort
+    RESUMABLE_UPLOAD_SWEEP_INTERVAL: int = int(os.getenv("RESUMABLE_UPLOAD_SWEEP_INTERVAL", "600"))  # seconds
 
     JITSI_APP_ID: str | None = os.getenv("JITSI_APP_ID")
     JITSI_APP_SECRET: str | None = os.getenv("JITSI_APP_SECRET")
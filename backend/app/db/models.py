@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, Integer, DateTime, Float, ForeignKey
+from sqlalchemy import String, Text, Integer, BigInteger, DateTime, Float, ForeignKey, LargeBinary, UniqueConstraint, Index, text
 from datetime import datetime
 
 Base = declarative_base()
@@ -40,7 +40,7 @@ class FormSubmission(Base):
     latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     geo_accuracy_m: Mapped[float | None] = mapped_column(Float, nullable=True)
-    captured_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    captured_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     
     # Link to claim
     claim_id: Mapped[int | None] = mapped_column(ForeignKey("claims.id"), nullable=True)
@@ -51,7 +51,7 @@ class Meeting(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     room_name: Mapped[str] = mapped_column(String(120), unique=True, index=True)
     session_id: Mapped[str] = mapped_column(String(100), unique=True, index=True)
-    claim_id: Mapped[int | None] = mapped_column(ForeignKey("claims.id"), nullable=True)
+    claim_id: Mapped[int | None] = mapped_column(ForeignKey("claims.id"), nullable=True, index=True)
     patient_name: Mapped[str | None] = mapped_column(String(120), nullable=True)
     procedure: Mapped[str | None] = mapped_column(String(200), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, active, completed
@@ -66,7 +66,7 @@ class Meeting(Base):
 class Recording(Base):
     __tablename__ = "recordings"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    meeting_id: Mapped[int | None] = mapped_column(ForeignKey("meetings.id"), nullable=True)
+    meeting_id: Mapped[int | None] = mapped_column(ForeignKey("meetings.id"), nullable=True, index=True)
     s3_key: Mapped[str] = mapped_column(String(512))
     s3_url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     mime_type: Mapped[str] = mapped_column(String(120))
@@ -81,6 +81,126 @@ class Recording(Base):
 
     meeting: Mapped[Meeting | None] = relationship("Meeting", back_populates="recordings")
 
+class UploadSession(Base):
+    """Resumable or live recording upload backed by an S3 multipart upload"""
+    __tablename__ = "upload_sessions"
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.id"), index=True)
+    kind: Mapped[str] = mapped_column(String(20), default="resumable")  # resumable, live
+    s3_key: Mapped[str] = mapped_column(String(512))
+    upload_id: Mapped[str] = mapped_column(String(1024))  # S3 multipart UploadId
+    mime_type: Mapped[str] = mapped_column(String(120))
+    part_size: Mapped[int] = mapped_column(Integer)
+    total_size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="active", index=True)  # active, completed, aborted
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    parts: Mapped[list["UploadPart"]] = relationship("UploadPart", back_populates="upload_session")
+
+    __table_args__ = (
+        # At most one active live upload per meeting
+        Index(
+            "uq_upload_sessions_live_meeting",
+            "meeting_id",
+            unique=True,
+            postgresql_where=text("kind = 'live' AND status = 'active'"),
+            sqlite_where=text("kind = 'live' AND status = 'active'"),
+        ),
+    )
+
+class UploadPart(Base):
+    __tablename__ = "upload_parts"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    upload_session_id: Mapped[str] = mapped_column(ForeignKey("upload_sessions.id"), index=True)
+    part_number: Mapped[int] = mapped_column(Integer)
+    etag: Mapped[str] = mapped_column(String(255))
+    size: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    upload_session: Mapped[UploadSession] = relationship("UploadSession", back_populates="parts")
+
+    __table_args__ = (
+        UniqueConstraint("upload_session_id", "part_number"),
+    )
+
+class UploadSegment(Base):
+    """Live-ingest bytes received but not yet part of an uploaded multipart part"""
+    __tablename__ = "upload_segments"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    upload_session_id: Mapped[str] = mapped_column(ForeignKey("upload_sessions.id"), index=True)
+    seq: Mapped[int] = mapped_column(Integer)
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    size: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("upload_session_id", "seq"),
+    )
+
+class SmsMessage(Base):
+    """Outbound SMS, delivered by the background dispatcher"""
+    __tablename__ = "sms_messages"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    to_number: Mapped[str] = mapped_column(String(20))
+    body: Mapped[str] = mapped_column(Text)
+    claim_id: Mapped[int | None] = mapped_column(ForeignKey("claims.id"), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)  # queued, sending, sent, failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    twilio_sid: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class OutboundEmail(Base):
+    """Outbound email, delivered by the background dispatcher in app/services/email_outbox.py"""
+    __tablename__ = "email_outbox"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    to_address: Mapped[str] = mapped_column(String(255), index=True)
+    subject: Mapped[str] = mapped_column(String(255))
+    text_body: Mapped[str] = mapped_column(Text)
+    html_body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attachment: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    attachment_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    kind: Mapped[str] = mapped_column(String(30), default="message")  # message, notification (may be sent as a digest)
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)  # queued, sending, sent, dead
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    digest_id: Mapped[int | None] = mapped_column(Integer, nullable=True)  # message whose digest carried this one
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ReportWatermark(Base):
+    """High-water mark of an incremental report: the last submission already reported"""
+    __tablename__ = "report_watermarks"
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)  # e.g. submissions_email
+    last_id: Mapped[int] = mapped_column(Integer, default=0)
+    last_captured_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Job(Base):
+    """Durable background job, run by the workers in app/services/jobs.py"""
+    __tablename__ = "jobs"
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50), index=True)
+    payload: Mapped[str] = mapped_column(Text)  # JSON
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)  # queued, running, succeeded, failed
+    progress: Mapped[int] = mapped_column(Integer, default=0)  # 0-100
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    locked_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
 class Geolocation(Base):
     __tablename__ = "geolocations"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
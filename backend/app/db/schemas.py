@@ -92,7 +92,8 @@ class VideoCallResponse(BaseModel):
     roomName: str
     roomUrl: str
     patientUrl: str
-    smsSent: bool = False
+    smsSent: bool = False  # True once the SMS is queued for delivery
+    smsMessageId: Optional[int] = None
     message: str
 
 class VideoCallStatusResponse(BaseModel):
@@ -126,15 +127,73 @@ class RecordingResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RecordingPresignRequest(BaseModel):
+    room_name: str
+    filename: str
+    content_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+class RecordingUploadCompleteRequest(BaseModel):
+    room_name: str
+    s3_key: str
+    upload_token: str
+    upload_id: Optional[str] = None
+    parts: Optional[List[UploadedPart]] = None
+    mime_type: Optional[str] = None
+    duration_sec: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    geo_accuracy_m: Optional[float] = None
+
+class ResumableUploadCreate(BaseModel):
+    room_name: str
+    filename: str
+    content_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+
+class ResumableUploadComplete(BaseModel):
+    duration_sec: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    geo_accuracy_m: Optional[float] = None
+
+class ClaimFilePresignRequest(BaseModel):
+    claim_id: str
+    filename: str
+    content_type: Optional[str] = None
+
 # SMS schemas
 class SMSSendRequest(BaseModel):
     phone_number: str
     message: str
     claim_id: Optional[str] = None
 
+class SMSStatusResponse(BaseModel):
+    id: int
+    to_number: str
+    status: str
+    attempts: int
+    twilio_sid: Optional[str] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    sent_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 # Email schemas
 class EmailRequest(BaseModel):
     to: EmailStr | None = None  # override default EMAIL_TO if needed
+    incremental: bool = False  # only submissions added since the last incremental run
+    since: datetime | None = None  # captured_at range (inclusive start)
+    until: datetime | None = None  # captured_at range (exclusive end)
+
+class WatermarkAck(BaseModel):
+    last_id: int  # X-Report-Last-Id of the incremental report the client received
 
 # Geolocation schemas
 class GeolocationCreate(BaseModel):
@@ -161,3 +220,15 @@ class GeolocationResponse(BaseModel):
 class GeolocationListResponse(BaseModel):
     geolocations: list[GeolocationResponse]
     total_count: int
+
+# Background job schemas
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    progress: int
+    attempts: int
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
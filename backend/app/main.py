@@ -3,8 +3,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.db.session import engine
 from app.db.models import Base
-from app.api.routers import forms, meetings, recordings, claims, jaas, geolocation, s3
+from app.api.routers import forms, meetings, recordings, claims, jaas, geolocation, s3, jobs
 from app.auth import router as auth_router
+from app.services.s3_multipart import shutdown_s3_executor, verify_bucket_on_startup
+from app.services.background import start_background_task, stop_background_tasks
+from app.services.resumable_uploads import start_upload_sweeper
+from app.services.room_pool import start_room_pool
+from app.services.sms import start_sms_dispatcher, shutdown_sms_executor
+from app.services.jobs import start_job_workers
+from app.services.pdf_executor import warm_pdf_executor, shutdown_pdf_executor
+from app.services.emailer import shutdown_smtp_pool
+from app.services.email_outbox import start_email_dispatcher
+from app.services.passwords import shutdown_password_executor
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -14,6 +24,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Report-Last-Id"],  # incremental submissions report
 )
 
 app.include_router(auth_router, prefix=settings.API_PREFIX)
@@ -24,8 +35,25 @@ app.include_router(claims.router, prefix=settings.API_PREFIX)
 app.include_router(geolocation.router, prefix=settings.API_PREFIX)
 app.include_router(jaas.router, prefix=settings.API_PREFIX)
 app.include_router(s3.router, prefix=settings.API_PREFIX)
+app.include_router(jobs.router, prefix=settings.API_PREFIX)
 
 @app.on_event("startup")
 async def startup():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+    await verify_bucket_on_startup()
+    start_upload_sweeper()
+    start_room_pool()
+    start_sms_dispatcher()
+    start_job_workers()
+    start_email_dispatcher()
+    start_background_task("pdf-pool-warmup", warm_pdf_executor())
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_background_tasks()
+    shutdown_s3_executor()
+    shutdown_password_executor()
+    shutdown_sms_executor()
+    shutdown_pdf_executor()
+    shutdown_smtp_pool()
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+_tasks: List[asyncio.Task] = []
+
+def start_periodic_task(name: str, func: Callable[[], Awaitable[None]], interval: float) -> asyncio.Task:
+    """
+    Run `func` every `interval` seconds until the application shuts down.
+    Errors are logged and the loop keeps going.
+    """
+    async def runner():
+        while True:
+            try:
+                await func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background task '{name}' failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+    task = asyncio.create_task(runner(), name=name)
+    _tasks.append(task)
+    logger.info(f"Started background task '{name}' (every {interval}s)")
+    return task
+
+def start_background_task(name: str, coro: Awaitable[None]) -> asyncio.Task:
+    """Run a long-lived coroutine until the application shuts down"""
+    task = asyncio.create_task(coro, name=name)
+    _tasks.append(task)
+    logger.info(f"Started background task '{name}'")
+    return task
+
+async def stop_background_tasks() -> None:
+    """Cancel every task started through this module (called on shutdown)"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,245 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import OutboundEmail
+from app.db.session import AsyncSessionLocal
+from app.services.background import start_background_task
+from app.services.emailer import build_message, send_message_async, notification_text
+
+logger = logging.getLogger(__name__)
+
+_wakeup: Optional[asyncio.Event] = None
+
+async def enqueue_email(
+    session: AsyncSession,
+    to_address: str,
+    subject: str,
+    text_body: str,
+    html_body: Optional[str] = None,
+    attachment: Optional[bytes] = None,
+    attachment_name: Optional[str] = None,
+) -> int:
+    """
+    Queue an email for delivery and return its id.
+
+    The row is committed here so the dispatcher (possibly on another replica)
+    can see it straight away.
+    """
+    message = OutboundEmail(
+        to_address=to_address,
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        attachment=attachment,
+        attachment_name=attachment_name,
+        kind="message",
+        status="queued",
+    )
+    session.add(message)
+    await session.commit()
+    if _wakeup is not None:
+        _wakeup.set()
+    return message.id
+
+async def enqueue_notification(
+    session: AsyncSession,
+    to_address: str,
+    subject: str,
+    message: str,
+    claim_number: Optional[str] = None,
+) -> int:
+    """
+    Queue a short notification. It waits EMAIL_DIGEST_WINDOW seconds so that
+    other notifications to the same recipient can go out as one digest.
+    """
+    if claim_number:
+        message = f"{message}\n\nClaim Number: {claim_number}"
+    notification = OutboundEmail(
+        to_address=to_address,
+        subject=subject,
+        text_body=message,
+        kind="notification",
+        status="queued",
+        next_attempt_at=datetime.utcnow() + timedelta(seconds=settings.EMAIL_DIGEST_WINDOW),
+    )
+    session.add(notification)
+    await session.commit()
+    return notification.id
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.EMAIL_RETRY_BASE_DELAY * (2 ** (attempts - 1)))
+
+async def _claim(session: AsyncSession, message: OutboundEmail) -> bool:
+    claimed = await session.execute(
+        update(OutboundEmail)
+        .where(
+            OutboundEmail.id == message.id,
+            OutboundEmail.status == message.status,
+            # Reclaiming a stuck row leaves it 'sending'; attempts tells the claims apart
+            OutboundEmail.attempts == message.attempts,
+        )
+        .values(status="sending", attempts=OutboundEmail.attempts + 1)
+    )
+    return claimed.rowcount == 1
+
+async def _claim_due_messages() -> List[List[OutboundEmail]]:
+    """
+    Move due messages to 'sending' and group them into deliveries.
+
+    A conditional UPDATE keeps replicas from sending twice. Each due
+    notification also pulls in every other queued notification to the same
+    recipient, and those go out together as one digest.
+    """
+    now = datetime.utcnow()
+    stuck_before = now - timedelta(seconds=settings.EMAIL_SENDING_TIMEOUT)
+    claimed_ids: List[int] = []
+    async with AsyncSessionLocal() as session:
+        due = or_(
+            and_(OutboundEmail.status == "queued", OutboundEmail.next_attempt_at <= now),
+            # A worker died mid-send; try again
+            and_(OutboundEmail.status == "sending", OutboundEmail.updated_at < stuck_before),
+        )
+        result = await session.execute(
+            select(OutboundEmail).where(due).order_by(OutboundEmail.id).limit(settings.EMAIL_BATCH_SIZE)
+        )
+        due_messages = list(result.scalars().all())
+
+        recipients = {m.to_address for m in due_messages if m.kind == "notification"}
+        if recipients:
+            result = await session.execute(
+                select(OutboundEmail).where(
+                    OutboundEmail.kind == "notification",
+                    OutboundEmail.status == "queued",
+                    OutboundEmail.to_address.in_(recipients),
+                    OutboundEmail.id.not_in([m.id for m in due_messages]),
+                )
+            )
+            due_messages.extend(result.scalars().all())
+
+        for message in due_messages:
+            if await _claim(session, message):
+                claimed_ids.append(message.id)
+        await session.commit()
+
+        if not claimed_ids:
+            return []
+        result = await session.execute(
+            select(OutboundEmail).where(OutboundEmail.id.in_(claimed_ids)).order_by(OutboundEmail.id)
+        )
+        claimed = list(result.scalars().all())
+
+    deliveries: List[List[OutboundEmail]] = []
+    digests: Dict[str, List[OutboundEmail]] = defaultdict(list)
+    for message in claimed:
+        if message.kind == "notification":
+            digests[message.to_address].append(message)
+        else:
+            deliveries.append([message])
+    deliveries.extend(digests.values())
+    return deliveries
+
+def _digest(to_address: str, messages: List[OutboundEmail]):
+    if len(messages) == 1:
+        m = messages[0]
+        return build_message(to_address, m.subject, notification_text(m.text_body))
+    sections = "\n\n".join(
+        f"{m.subject}\n{'-' * len(m.subject)}\n{m.text_body}" for m in messages
+    )
+    text_body = f"""
+VerifyCall Notifications
+
+You have {len(messages)} new notifications.
+
+{sections}
+
+---
+This is an automated notification from VerifyCall system.
+
+VerifyCall - Secure Video Verification Platform
+    """.strip()
+    return build_message(to_address, f"VerifyCall - {len(messages)} notifications", text_body)
+
+async def _deliver(messages: List[OutboundEmail]) -> None:
+    first = messages[0]
+    ids = [m.id for m in messages]
+    try:
+        if not settings.SMTP_HOST:
+            raise RuntimeError("SMTP not configured")
+        if first.kind == "notification":
+            msg = _digest(first.to_address, messages)
+        else:
+            msg = build_message(
+                first.to_address, first.subject, first.text_body,
+                first.html_body, first.attachment, first.attachment_name
+            )
+        await send_message_async(msg)
+        values = {"status": "sent", "sent_at": datetime.utcnow(), "last_error": None}
+        if len(messages) > 1:
+            values["digest_id"] = first.id
+        logger.info(f"Email {first.id} sent to {first.to_address}" + (f" (digest of {len(messages)})" if len(messages) > 1 else ""))
+    except Exception as e:
+        attempts = max(m.attempts for m in messages)
+        if attempts >= settings.EMAIL_MAX_ATTEMPTS or not settings.SMTP_HOST:
+            values = {"status": "dead", "last_error": str(e)}
+            logger.error(f"Email {first.id} to {first.to_address} dead-lettered: {str(e)}")
+        else:
+            values = {
+                "status": "queued",
+                "last_error": str(e),
+                "next_attempt_at": datetime.utcnow() + _backoff(attempts),
+            }
+            logger.warning(f"Email {first.id} attempt {attempts} failed, will retry: {str(e)}")
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(OutboundEmail).where(OutboundEmail.id.in_(ids)).values(**values))
+        await session.commit()
+
+async def dispatch_due_emails() -> int:
+    """Send one batch of due messages; concurrency is bounded by the SMTP pool"""
+    deliveries = await _claim_due_messages()
+    if deliveries:
+        await asyncio.gather(*(_deliver(d) for d in deliveries))
+    return len(deliveries)
+
+async def requeue_dead_email(session: AsyncSession, message_id: int) -> bool:
+    """Put a dead-lettered message back in the queue with a fresh attempt budget"""
+    result = await session.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id == message_id, OutboundEmail.status == "dead")
+        .values(status="queued", attempts=0, next_attempt_at=datetime.utcnow())
+    )
+    await session.commit()
+    if result.rowcount == 1 and _wakeup is not None:
+        _wakeup.set()
+    return result.rowcount == 1
+
+async def _run_dispatcher() -> None:
+    while True:
+        try:
+            sent = await dispatch_due_emails()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Email dispatcher failed: {str(e)}")
+            sent = 0
+        if sent:
+            # A full batch may mean more is waiting
+            continue
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.EMAIL_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+def start_email_dispatcher() -> None:
+    """Start the outbound email dispatcher (called on application startup)"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    start_background_task("email-dispatcher", _run_dispatcher())
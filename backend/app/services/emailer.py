@@ -1,11 +1,15 @@
 import smtplib, ssl
+import asyncio
 from email.message import EmailMessage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
+import time
 
 from app.core.config import settings
 
@@ -24,62 +28,286 @@ def send_email_with_attachment(subject: str, body: str, pdf_bytes: bytes, filena
     msg.set_content(body)
     msg.add_attachment(pdf_bytes, maintype="application", subtype="pdf", filename=filename)
 
-    context = ssl.create_default_context()
-    port = settings.SMTP_PORT or 587
-    with smtplib.SMTP(settings.SMTP_HOST, port) as server:
+    send_message(msg)
+
+class SMTPConnection:
+    """
+    One authenticated SMTP session reused for many messages.
+
+    Connects lazily on the first send and reconnects once if the server has
+    dropped the session. Sends are serialized, so worker threads can share
+    one connection.
+    """
+    
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+        self.sent = 0  # messages sent on the current session
+        self.last_used = 0.0
+    
+    def _connect(self) -> smtplib.SMTP:
+        if not settings.SMTP_HOST:
+            raise RuntimeError("SMTP not configured")
+        context = ssl.create_default_context()
+        port = settings.SMTP_PORT or 587
+        server = smtplib.SMTP(settings.SMTP_HOST, port, timeout=settings.SMTP_TIMEOUT)
         server.starttls(context=context)
-        if settings.SMTP_USER:
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD or "")
-        server.send_message(msg)
+        if settings.SMTP_USER and settings.SMTP_PASSWORD:
+            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        self.sent = 0
+        return server
+    
+    def is_alive(self) -> bool:
+        """NOOP round trip; False if the server has closed the session"""
+        with self._lock:
+            if self._server is None:
+                return False
+            try:
+                return self._server.noop()[0] == 250
+            except Exception:
+                return False
+    
+    def send_message(self, msg) -> None:
+        with self._lock:
+            if self._server is None:
+                self._server = self._connect()
+            try:
+                self._server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Idle sessions get dropped by the server; the message wasn't accepted, so resend
+                self._server = self._connect()
+                self._server.send_message(msg)
+            self.sent += 1
+            self.last_used = time.monotonic()
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._server is not None:
+                try:
+                    self._server.quit()
+                except Exception:
+                    pass
+                self._server = None
+    
+    def __enter__(self) -> "SMTPConnection":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-def send_claim_verification_email(
+class SMTPPool:
+    """
+    Pool of up to SMTP_POOL_SIZE authenticated SMTP sessions.
+
+    Idle sessions are checked with NOOP before reuse and dropped once they
+    have been idle for SMTP_IDLE_TIMEOUT or have sent
+    SMTP_MAX_MESSAGES_PER_CONNECTION messages, so bulk runs pay the
+    TCP + TLS + AUTH handshake once per session rather than once per email.
+    """
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._idle: List[SMTPConnection] = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self._closed = False
+    
+    def _checkout(self) -> SMTPConnection:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("SMTP pool is shut down")
+                if self._idle:
+                    connection = self._idle.pop()  # most recently used first
+                    break
+                if self._open < self._size:
+                    self._open += 1
+                    return SMTPConnection()
+                self._cond.wait()
+        
+        # Sessions idle for a few seconds get a NOOP before we trust them again
+        idle_for = time.monotonic() - connection.last_used
+        if idle_for > settings.SMTP_IDLE_TIMEOUT or (idle_for > 5 and not connection.is_alive()):
+            connection.close()  # reconnects lazily on the next send
+        return connection
+    
+    def _checkin(self, connection: SMTPConnection, healthy: bool) -> None:
+        if not healthy or connection.sent >= settings.SMTP_MAX_MESSAGES_PER_CONNECTION:
+            connection.close()
+        with self._cond:
+            if self._closed:
+                connection.close()
+                self._open -= 1
+            else:
+                self._idle.append(connection)
+            self._cond.notify()
+    
+    def send_message(self, msg) -> None:
+        """Send one message on a pooled session (blocking)"""
+        connection = self._checkout()
+        healthy = False
+        try:
+            connection.send_message(msg)
+            healthy = True
+        finally:
+            self._checkin(connection, healthy)
+    
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            connection.close()
+
+_pool: Optional[SMTPPool] = None
+_pool_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_smtp_pool() -> SMTPPool:
+    """Get the process-wide SMTP session pool"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SMTPPool(settings.SMTP_POOL_SIZE)
+    return _pool
+
+def _get_smtp_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _pool_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.SMTP_POOL_SIZE, thread_name_prefix="smtp")
+    return _executor
+
+def send_message(msg) -> None:
+    """Send a prepared message through the SMTP pool (blocking)"""
+    if not settings.SMTP_HOST:
+        raise RuntimeError("SMTP not configured")
+    get_smtp_pool().send_message(msg)
+
+async def send_message_async(msg) -> None:
+    """Send a prepared message through the SMTP pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_get_smtp_executor(), send_message, msg)
+
+def shutdown_smtp_pool() -> None:
+    """Close pooled SMTP sessions (called on application shutdown)"""
+    global _pool, _executor
+    # Reset both so a later startup in the same process gets fresh ones
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+def build_message(
+    to_address: str,
+    subject: str,
+    text_body: str,
+    html_body: Optional[str] = None,
+    attachment: Optional[bytes] = None,
+    attachment_name: Optional[str] = None
+) -> MIMEMultipart:
+    """Build a text (+ optional HTML) message with an optional PDF attachment"""
+    msg = MIMEMultipart('mixed')
+    msg['Subject'] = subject
+    msg['From'] = settings.EMAIL_FROM
+    msg['To'] = to_address
+    
+    body = MIMEMultipart('alternative')
+    body.attach(MIMEText(text_body, 'plain'))
+    if html_body:
+        body.attach(MIMEText(html_body, 'html'))
+    msg.attach(body)
+    
+    if attachment:
+        pdf_attachment = MIMEApplication(attachment, _subtype='pdf')
+        pdf_attachment.add_header('Content-Disposition', 'attachment', filename=attachment_name or 'attachment.pdf')
+        msg.attach(pdf_attachment)
+    
+    return msg
+
+def should_link_attachment(size: int) -> bool:
+    """Large PDFs go out as a presigned S3 link; MIME base64 would add about 33% to the message"""
+    return bool(settings.S3_BUCKET) and 0 < settings.EMAIL_ATTACHMENT_MAX_BYTES < size
+
+def link_expiry_text() -> str:
+    hours = settings.EMAIL_LINK_EXPIRY // 3600
+    return f"{hours // 24} days" if hours >= 48 else f"{hours} hours"
+
+def claim_verification_email_subject(claim_data: Dict[str, Any]) -> str:
+    return f"VerifyCall - Claim Verification Report: {claim_data.get('claim_number', 'N/A')}"
+
+def claim_verification_pdf_filename(claim_data: Dict[str, Any]) -> str:
+    return f"claim_verification_{claim_data.get('claim_number', 'report')}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+def build_claim_verification_message(
     claim_data: Dict[str, Any],
     meeting_data: Dict[str, Any],
     pdf_bytes: bytes,
     recipient_email: str,
     recording_data: Optional[Dict[str, Any]] = None
+) -> MIMEMultipart:
+    """Build the claim verification email (HTML + text bodies, PDF attached)"""
+    
+    # Create message
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = claim_verification_email_subject(claim_data)
+    msg['From'] = settings.EMAIL_FROM
+    msg['To'] = recipient_email
+    
+    # Create HTML email body
+    html_body = create_claim_verification_email_html(claim_data, meeting_data, recording_data)
+    
+    # Create plain text version
+    text_body = create_claim_verification_email_text(claim_data, meeting_data, recording_data)
+    
+    # Attach both versions
+    part1 = MIMEText(text_body, 'plain')
+    part2 = MIMEText(html_body, 'html')
+    
+    msg.attach(part1)
+    msg.attach(part2)
+    
+    # Attach PDF report
+    pdf_filename = claim_verification_pdf_filename(claim_data)
+    pdf_attachment = MIMEApplication(pdf_bytes, _subtype='pdf')
+    pdf_attachment.add_header('Content-Disposition', 'attachment', filename=pdf_filename)
+    msg.attach(pdf_attachment)
+    
+    return msg
+
+def send_claim_verification_email(
+    claim_data: Dict[str, Any],
+    meeting_data: Dict[str, Any],
+    pdf_bytes: bytes,
+    recipient_email: str,
+    recording_data: Optional[Dict[str, Any]] = None,
+    connection: Optional[SMTPConnection] = None
 ) -> bool:
-    """Send claim verification report email with professional formatting"""
+    """
+    Send claim verification report email with professional formatting.
+    Goes through the SMTP pool unless an SMTPConnection is passed in.
+    """
     
     if not settings.SMTP_HOST:
         logger.error("SMTP not configured")
         raise RuntimeError("SMTP not configured")
     
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f"VerifyCall - Claim Verification Report: {claim_data.get('claim_number', 'N/A')}"
-        msg['From'] = settings.EMAIL_FROM
-        msg['To'] = recipient_email
-        
-        # Create HTML email body
-        html_body = create_claim_verification_email_html(claim_data, meeting_data, recording_data)
-        
-        # Create plain text version
-        text_body = create_claim_verification_email_text(claim_data, meeting_data, recording_data)
-        
-        # Attach both versions
-        part1 = MIMEText(text_body, 'plain')
-        part2 = MIMEText(html_body, 'html')
-        
-        msg.attach(part1)
-        msg.attach(part2)
-        
-        # Attach PDF report
-        pdf_filename = f"claim_verification_{claim_data.get('claim_number', 'report')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        pdf_attachment = MIMEApplication(pdf_bytes, _subtype='pdf')
-        pdf_attachment.add_header('Content-Disposition', 'attachment', filename=pdf_filename)
-        msg.attach(pdf_attachment)
-        
-        # Send email
-        context = ssl.create_default_context()
-        port = settings.SMTP_PORT or 587
+        msg = build_claim_verification_message(
+            claim_data, meeting_data, pdf_bytes, recipient_email, recording_data
+        )
         
-        with smtplib.SMTP(settings.SMTP_HOST, port) as server:
-            server.starttls(context=context)
-            if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        # Send email (pooled session unless the caller brings its own)
+        if connection is not None:
+            connection.send_message(msg)
+        else:
+            send_message(msg)
         
         logger.info(f"Claim verification email sent successfully to {recipient_email}")
         return True
@@ -91,9 +319,18 @@ def send_claim_verification_email(
 def create_claim_verification_email_html(
     claim_data: Dict[str, Any],
     meeting_data: Dict[str, Any],
-    recording_data: Optional[Dict[str, Any]] = None
+    recording_data: Optional[Dict[str, Any]] = None,
+    report_url: Optional[str] = None
 ) -> str:
-    """Create HTML email body for claim verification"""
+    """Create HTML email body for claim verification (report_url: link to the PDF instead of attaching it)"""
+    
+    if report_url:
+        report_note = (
+            f'<a href="{report_url}" target="_blank">Download the complete verification report (PDF)</a>. '
+            f'The link expires in {link_expiry_text()}.'
+        )
+    else:
+        report_note = "Please find the complete verification report attached as a PDF."
     
     verification_status = "COMPLETED" if recording_data else "PENDING"
     status_color = "#28a745" if recording_data else "#ffc107"
@@ -213,7 +450,7 @@ def create_claim_verification_email_html(
             </div>
             
             <div class="footer">
-                <p><strong>📎 Detailed Report:</strong> Please find the complete verification report attached as a PDF.</p>
+                <p><strong>📎 Detailed Report:</strong> {report_note}</p>
                 <hr>
                 <p><em>This email was generated automatically by VerifyCall system on {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}.</em></p>
                 <p><em>All information is confidential and should be handled according to HIPAA guidelines.</em></p>
@@ -229,9 +466,15 @@ def create_claim_verification_email_html(
 def create_claim_verification_email_text(
     claim_data: Dict[str, Any],
     meeting_data: Dict[str, Any],
-    recording_data: Optional[Dict[str, Any]] = None
+    recording_data: Optional[Dict[str, Any]] = None,
+    report_url: Optional[str] = None
 ) -> str:
-    """Create plain text email body for claim verification"""
+    """Create plain text email body for claim verification (report_url: link to the PDF instead of attaching it)"""
+    
+    if report_url:
+        report_note = f"REPORT:\nDownload the complete verification report (link expires in {link_expiry_text()}):\n{report_url}"
+    else:
+        report_note = "ATTACHMENT:\nPlease find the complete verification report attached as a PDF."
     
     verification_status = "COMPLETED" if recording_data else "PENDING"
     
@@ -273,8 +516,7 @@ VERIFICATION SUMMARY:
 - Geolocation: {'Captured' if recording_data and recording_data.get('latitude') else 'Not Captured'}
 - Compliance: {'COMPLIANT' if recording_data else 'PENDING'}
 
-ATTACHMENT:
-Please find the complete verification report attached as a PDF.
+{report_note}
 
 ---
 This email was generated automatically by VerifyCall system on {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}.
@@ -285,54 +527,16 @@ VerifyCall - Secure Video Verification Platform
     
     return text
 
-def send_simple_notification_email(
-    to_email: str,
-    subject: str,
-    message: str,
-    claim_number: Optional[str] = None
-) -> bool:
-    """Send a simple notification email"""
-    
-    if not settings.SMTP_HOST:
-        logger.error("SMTP not configured")
-        return False
-    
-    try:
-        msg = EmailMessage()
-        msg['Subject'] = subject
-        msg['From'] = settings.EMAIL_FROM
-        msg['To'] = to_email
-        
-        # Create formatted message
-        formatted_message = f"""
+def notification_text(message: str) -> str:
+    """Body of a single notification email (several go out as a digest instead)"""
+    return f"""
 VerifyCall Notification
 
 {message}
 
-{f'Claim Number: {claim_number}' if claim_number else ''}
-
 ---
 This is an automated notification from VerifyCall system.
 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
 
 VerifyCall - Secure Video Verification Platform
-        """.strip()
-        
-        msg.set_content(formatted_message)
-        
-        # Send email
-        context = ssl.create_default_context()
-        port = settings.SMTP_PORT or 587
-        
-        with smtplib.SMTP(settings.SMTP_HOST, port) as server:
-            server.starttls(context=context)
-            if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-        
-        logger.info(f"Notification email sent successfully to {to_email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send notification email: {str(e)}")
-        return False
+    """.strip()
@@ -0,0 +1,90 @@
+from typing import Any, Dict, List
+import base64
+import threading
+import time
+import uuid
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from app.core.config import settings
+
+_private_key = None
+_private_key_lock = threading.Lock()
+
+def get_jaas_private_key():
+    """
+    Decode and parse JAAS_PRIVATE_KEY once per process.
+
+    PyJWT accepts the parsed key object directly, so every token after the
+    first skips the base64 decode and PEM parse.
+    """
+    global _private_key
+    if not settings.JAAS_PRIVATE_KEY or not settings.JAAS_APP_ID or not settings.JAAS_API_KEY_ID:
+        raise ValueError("Missing JaaS configuration. Check JAAS_PRIVATE_KEY, JAAS_APP_ID, and JAAS_API_KEY_ID")
+    if _private_key is None:
+        with _private_key_lock:
+            if _private_key is None:
+                _private_key = serialization.load_pem_private_key(
+                    base64.b64decode(settings.JAAS_PRIVATE_KEY),  # Decode base64 private key
+                    password=None,
+                )
+    return _private_key
+
+def mint_jaas_token(
+    room_name: str,
+    user_name: str,
+    user_email: str = "",
+    avatar_url: str = "",
+    moderator: bool = True,
+) -> str:
+    """Mint a JaaS (8x8) RS256 JWT for one participant"""
+    private_key = get_jaas_private_key()
+    now = int(time.time())
+
+    payload = {
+        "aud": "jitsi",  # Constant audience for JaaS
+        "iss": "chat",   # Our issuer name
+        "sub": settings.JAAS_APP_ID,  # App ID from 8x8
+        "room": room_name,
+        "exp": now + settings.JAAS_TOKEN_TTL,
+        "nbf": now - 10,    # Valid from 10 seconds ago (clock skew)
+        "context": {
+            "user": {
+                "id": str(uuid.uuid4()),  # Generate unique user ID
+                "name": user_name,
+                "email": user_email,
+                "avatar": avatar_url,
+                "moderator": moderator
+            },
+            "features": {
+                "recording": moderator,
+                "livestreaming": moderator,
+                "transcription": moderator,
+                "outbound-call": moderator
+            }
+        }
+    }
+
+    headers = {
+        "kid": settings.JAAS_API_KEY_ID,  # API Key ID from 8x8
+        "typ": "JWT",
+        "alg": "RS256"
+    }
+
+    return jwt.encode(payload, private_key, algorithm="RS256", headers=headers)
+
+def mint_jaas_tokens(room_name: str, participants: List[Dict[str, Any]]) -> List[str]:
+    """
+    Mint tokens for several participants of one room in a single call.
+    Each participant dict takes the keyword arguments of mint_jaas_token.
+    """
+    return [mint_jaas_token(room_name, **participant) for participant in participants]
+
+def mint_call_tokens(room_name: str, patient_name: str, moderator_name: str = "Doctor") -> Dict[str, str]:
+    """Mint the moderator and patient tokens for a verification call"""
+    moderator_token, patient_token = mint_jaas_tokens(room_name, [
+        {"user_name": moderator_name, "moderator": True},
+        {"user_name": patient_name, "moderator": False},
+    ])
+    return {"moderator": moderator_token, "patient": patient_token}
@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import uuid4
+import json
+import logging
+import os
+import socket
+
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Job
+from app.db.session import AsyncSessionLocal, engine
+from app.services.background import start_background_task
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (bad payload, missing rows)"""
+
+class JobContext:
+    """Handed to job handlers so they can report progress"""
+
+    def __init__(self, job_id: str, attempt: int):
+        self.job_id = job_id
+        self.attempt = attempt
+
+    async def set_progress(self, progress: int) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Job).where(Job.id == self.job_id).values(progress=max(0, min(100, progress)))
+            )
+            await session.commit()
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any], JobContext], Awaitable[Optional[Dict[str, Any]]]]
+
+_handlers: Dict[str, JobHandler] = {}
+_wakeup: Optional[asyncio.Event] = None
+
+def job_handler(kind: str):
+    """
+    Register a coroutine as the handler for a job kind.
+
+    The handler gets a fresh session, the decoded payload and a JobContext,
+    and may return a JSON-serializable dict that is stored as the job result.
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+    return decorator
+
+async def enqueue_job(
+    session: AsyncSession,
+    kind: str,
+    payload: Dict[str, Any],
+    max_attempts: Optional[int] = None,
+    commit: bool = True,
+) -> str:
+    """
+    Persist a job and return its id. Commits, so any worker can pick it up
+    straight away; with commit=False the job joins the caller's transaction
+    and the caller should call wake_job_workers() after committing.
+    """
+    job = Job(
+        id=str(uuid4()),
+        kind=kind,
+        payload=json.dumps(payload, default=str),
+        status="queued",
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    session.add(job)
+    if commit:
+        await session.commit()
+        wake_job_workers()
+    return job.id
+
+def wake_job_workers() -> None:
+    """Nudge idle workers in this process instead of waiting for the next poll"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+def job_status(job: Job) -> Dict[str, Any]:
+    """Serialize a job for status endpoints"""
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "attempts": job.attempts,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.last_error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+def _claimable(now: datetime):
+    stale_before = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    return or_(
+        and_(Job.status == "queued", Job.run_after <= now),
+        # The worker holding it died; hand it to someone else
+        and_(Job.status == "running", Job.locked_at < stale_before),
+    )
+
+async def _claim_next_job() -> Optional[Job]:
+    """
+    Lock the next runnable job for this worker.
+
+    PostgreSQL uses SELECT ... FOR UPDATE SKIP LOCKED so replicas never block
+    on each other; SQLite (no row locks) falls back to a conditional UPDATE.
+    """
+    now = datetime.utcnow()
+    # Unique per claim: coroutines in one process share WORKER_ID, and a stale
+    # job may be reclaimed by a sibling while the original worker still runs it
+    lock_token = f"{WORKER_ID}:{uuid4().hex[:16]}"
+    claim_values = dict(status="running", locked_by=lock_token, locked_at=now, attempts=Job.attempts + 1)
+
+    async with AsyncSessionLocal() as session:
+        if engine.dialect.name == "postgresql":
+            result = await session.execute(
+                select(Job)
+                .where(_claimable(now))
+                .order_by(Job.run_after)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if job is None:
+                return None
+            await session.execute(update(Job).where(Job.id == job.id).values(**claim_values))
+            await session.commit()
+            return await session.get(Job, job.id, populate_existing=True)
+
+        result = await session.execute(
+            select(Job).where(_claimable(now)).order_by(Job.run_after).limit(5)
+        )
+        for job in result.scalars().all():
+            claimed = await session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == job.status, Job.attempts == job.attempts)
+                .values(**claim_values)
+            )
+            if claimed.rowcount == 1:
+                await session.commit()
+                return await session.get(Job, job.id, populate_existing=True)
+        await session.rollback()
+        return None
+
+async def _finish(job: Job, **values) -> None:
+    """Record a job's outcome, unless it has since been reclaimed under another lock token"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Job).where(Job.id == job.id, Job.locked_by == job.locked_by).values(**values)
+        )
+        await session.commit()
+
+async def run_job(job: Job) -> None:
+    """Run a claimed job and record success, retry or failure"""
+    handler = _handlers.get(job.kind)
+    if handler is None:
+        await _finish(job, status="failed", last_error=f"No handler for job kind '{job.kind}'",
+                      locked_by=None, finished_at=datetime.utcnow())
+        return
+
+    context = JobContext(job.id, job.attempts)
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await handler(session, json.loads(job.payload), context)
+        await _finish(
+            job,
+            status="succeeded",
+            progress=100,
+            result=json.dumps(result, default=str) if result is not None else None,
+            last_error=None,
+            locked_by=None,
+            finished_at=datetime.utcnow(),
+        )
+        logger.info(f"Job {job.id} ({job.kind}) succeeded")
+    except Exception as e:
+        if isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts:
+            await _finish(job, status="failed", last_error=str(e), locked_by=None,
+                          finished_at=datetime.utcnow())
+            logger.error(f"Job {job.id} ({job.kind}) failed permanently: {str(e)}")
+        else:
+            delay = settings.JOB_RETRY_BASE_DELAY * (2 ** (job.attempts - 1))
+            await _finish(job, status="queued", last_error=str(e), locked_by=None,
+                          run_after=datetime.utcnow() + timedelta(seconds=delay))
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, retrying in {delay}s: {str(e)}")
+
+async def _run_worker(index: int) -> None:
+    while True:
+        try:
+            job = await _claim_next_job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job worker {index} could not claim a job: {str(e)}")
+            job = None
+
+        if job is not None:
+            try:
+                await run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Recording the outcome failed; the lock times out and another worker retries it
+                logger.error(f"Job worker {index} could not record job {job.id}: {str(e)}")
+            continue
+
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+def start_job_workers() -> None:
+    """Start JOB_WORKERS job workers in this process (called on application startup)"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    for index in range(settings.JOB_WORKERS):
+        start_background_task(f"job-worker-{index}", _run_worker(index))
@@ -0,0 +1,229 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import uuid4
+import logging
+
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Meeting, Recording, UploadSession, UploadPart, UploadSegment
+from app.db.session import AsyncSessionLocal
+from app.services.s3 import generate_s3_url, s3_key_for_live_recording
+from app.services.s3_multipart import (
+    ensure_bucket_ready_async,
+    multipart_part_size,
+    create_multipart_upload,
+    upload_part,
+    complete_multipart_upload,
+    abort_multipart_upload,
+)
+
+logger = logging.getLogger(__name__)
+
+async def _find_live_upload(session: AsyncSession, meeting_id: int, lock: bool = False) -> Optional[UploadSession]:
+    query = select(UploadSession).where(
+        UploadSession.meeting_id == meeting_id,
+        UploadSession.kind == "live",
+        UploadSession.status == "active",
+    )
+    if lock:
+        query = query.with_for_update()
+    result = await session.execute(query)
+    return result.scalar_one_or_none()
+
+async def open_live_upload(meeting: Meeting, content_type: str) -> UploadSession:
+    """Return the meeting's active live upload, starting a multipart upload if there is none"""
+    async with AsyncSessionLocal() as session:
+        upload = await _find_live_upload(session, meeting.id)
+        if upload:
+            return upload
+
+        await ensure_bucket_ready_async()
+        upload_session_id = str(uuid4())
+        key = s3_key_for_live_recording(meeting.room_name, content_type, upload_session_id)
+        upload_id = await create_multipart_upload(
+            key,
+            content_type,
+            metadata={
+                "room_name": meeting.room_name,
+                "meeting_id": str(meeting.id),
+                "uploaded_by": "verifycall_live_ingest"
+            }
+        )
+        upload = UploadSession(
+            id=upload_session_id,
+            meeting_id=meeting.id,
+            kind="live",
+            s3_key=key,
+            upload_id=upload_id,
+            mime_type=content_type,
+            part_size=multipart_part_size(),
+            status="active",
+        )
+        session.add(upload)
+        try:
+            await session.commit()
+        except IntegrityError:
+            # Another segment opened the live upload first; use that one
+            await session.rollback()
+            await abort_multipart_upload(key, upload_id)
+            upload = await _find_live_upload(session, meeting.id)
+            if upload is None:
+                raise
+            return upload
+        logger.info(f"Started live ingest for room {meeting.room_name} -> {key}")
+        return upload
+
+async def _buffered_bytes(session: AsyncSession, upload_id: str) -> int:
+    result = await session.execute(
+        select(func.coalesce(func.sum(UploadSegment.size), 0))
+        .where(UploadSegment.upload_session_id == upload_id)
+    )
+    return result.scalar_one()
+
+async def _flush_parts(session: AsyncSession, upload: UploadSession, final: bool = False) -> int:
+    """
+    Upload every whole part of the buffered segments (and the remainder when
+    final), replacing the consumed segments with one holding the leftover.
+
+    The caller holds the upload row lock and commits, so the new UploadPart
+    rows and the segment changes land together. If anything fails the
+    rollback keeps the old segments, and the retry re-uploads the same bytes
+    under the same part numbers.
+    """
+    result = await session.execute(
+        select(func.coalesce(func.max(UploadPart.part_number), 0))
+        .where(UploadPart.upload_session_id == upload.id)
+    )
+    part_number = result.scalar_one()
+
+    result = await session.execute(
+        select(UploadSegment)
+        .where(UploadSegment.upload_session_id == upload.id)
+        .order_by(UploadSegment.seq)
+    )
+    segments = list(result.scalars().all())
+    if not segments:
+        return part_number
+    data = b"".join(segment.data for segment in segments)
+
+    offset = 0
+    while len(data) - offset >= upload.part_size or (final and offset < len(data)):
+        chunk = data[offset:offset + upload.part_size]
+        part_number += 1
+        etag = await upload_part(upload.s3_key, upload.upload_id, part_number, chunk)
+        session.add(UploadPart(
+            upload_session_id=upload.id,
+            part_number=part_number,
+            etag=etag,
+            size=len(chunk),
+        ))
+        offset += len(chunk)
+
+    if offset:
+        await session.execute(
+            delete(UploadSegment).where(UploadSegment.upload_session_id == upload.id)
+        )
+        if offset < len(data):
+            # Keeps the last seq so later segments still sort after it
+            session.add(UploadSegment(
+                upload_session_id=upload.id,
+                seq=segments[-1].seq,
+                data=data[offset:],
+                size=len(data) - offset,
+            ))
+    return part_number
+
+async def append_segment(upload: UploadSession, data: bytes) -> Dict[str, int]:
+    """
+    Append a MediaRecorder segment to the live upload.
+
+    Each segment is stored as its own upload_segments row until they add up
+    to one multipart part (S3 rejects parts under 5 MiB); only then are they
+    concatenated and sent to S3 as the next part. The upload row is locked
+    for the append so segments arriving on different workers or replicas are
+    numbered and flushed one at a time, in order.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(UploadSession).where(UploadSession.id == upload.id).with_for_update()
+        )
+        locked = result.scalar_one()
+        if locked.status != "active":
+            raise RuntimeError(f"Live upload {upload.id} is {locked.status}")
+
+        result = await session.execute(
+            select(func.coalesce(func.max(UploadSegment.seq), 0))
+            .where(UploadSegment.upload_session_id == upload.id)
+        )
+        session.add(UploadSegment(
+            upload_session_id=upload.id,
+            seq=result.scalar_one() + 1,
+            data=data,
+            size=len(data),
+        ))
+        locked.updated_at = datetime.utcnow()
+        await session.flush()
+
+        buffered_bytes = await _buffered_bytes(session, upload.id)
+        if buffered_bytes >= locked.part_size:
+            await _flush_parts(session, locked)
+            await session.flush()
+            buffered_bytes = await _buffered_bytes(session, upload.id)
+
+        result = await session.execute(
+            select(func.count()).select_from(UploadPart).where(UploadPart.upload_session_id == upload.id)
+        )
+        parts_uploaded = result.scalar_one()
+        await session.commit()
+        return {"parts_uploaded": parts_uploaded, "buffered_bytes": buffered_bytes}
+
+async def finalize_live_upload(session: AsyncSession, meeting: Meeting) -> Optional[Dict]:
+    """
+    Complete the meeting's live upload, if any, and store the Recording row.
+
+    Everything but the buffered segments is already in S3, so this is the last part plus a
+    single CompleteMultipartUpload call.
+    """
+    # Locked until the commit below, so no segment can slip in after the last ones are flushed
+    upload = await _find_live_upload(session, meeting.id, lock=True)
+    if not upload:
+        return None
+
+    await _flush_parts(session, upload, final=True)
+
+    result = await session.execute(
+        select(UploadPart)
+        .where(UploadPart.upload_session_id == upload.id)
+        .order_by(UploadPart.part_number)
+    )
+    parts = result.scalars().all()
+
+    if not parts:
+        await abort_multipart_upload(upload.s3_key, upload.upload_id)
+        upload.status = "aborted"
+        await session.commit()
+        return None
+
+    await complete_multipart_upload(
+        upload.s3_key,
+        upload.upload_id,
+        [{"PartNumber": p.part_number, "ETag": p.etag} for p in parts]
+    )
+
+    s3_url = generate_s3_url(upload.s3_key)
+    result = await session.execute(
+        insert(Recording).values(
+            meeting_id=meeting.id,
+            s3_key=upload.s3_key,
+            s3_url=s3_url,
+            mime_type=upload.mime_type,
+        ).returning(Recording.id)
+    )
+    recording_id = result.scalar_one()
+    upload.status = "completed"
+    await session.commit()
+
+    logger.info(f"Finalized live recording for room {meeting.room_name}: {upload.s3_key}")
+    return {"recording_id": recording_id, "s3_key": upload.s3_key, "s3_url": s3_url}
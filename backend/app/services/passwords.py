@@ -0,0 +1,101 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+import logging
+import threading
+import time
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pinning min/max rounds to the configured cost makes passlib flag hashes made
+# with any other cost as needing an update, so they get rehashed on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify calls are already queued"""
+
+# bcrypt releases the GIL while hashing, so a thread pool spreads it across cores
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+_stats_lock = threading.Lock()
+_pending = 0
+_stats: Dict[str, Any] = {
+    "hashed": 0,
+    "verified": 0,
+    "rehashed": 0,
+    "rejected_busy": 0,
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        elapsed = time.perf_counter() - started
+        with _stats_lock:
+            _stats["total_seconds"] += elapsed
+            _stats["max_seconds"] = max(_stats["max_seconds"], elapsed)
+
+async def _run(func, *args):
+    """Run a bcrypt call on the pool, refusing work beyond the queue limit"""
+    global _pending
+    with _stats_lock:
+        if _pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+            _stats["rejected_busy"] += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, _timed, func, *args)
+    finally:
+        with _stats_lock:
+            _pending -= 1
+
+async def hash_password(password: str) -> str:
+    """Hash a password off the event loop"""
+    hashed = await _run(pwd_context.hash, password)
+    with _stats_lock:
+        _stats["hashed"] += 1
+    return hashed
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password off the event loop.
+
+    Returns (valid, new_hash). new_hash is set when the stored hash was made
+    with a different bcrypt cost and should replace the stored one.
+    """
+    valid, new_hash = await _run(pwd_context.verify_and_update, plain_password, hashed_password)
+    with _stats_lock:
+        _stats["verified"] += 1
+        if new_hash:
+            _stats["rehashed"] += 1
+    return valid, new_hash
+
+def hashing_stats() -> Dict[str, Any]:
+    """Snapshot of pool metrics (queue depth, call counts, timings)"""
+    with _stats_lock:
+        calls = _stats["hashed"] + _stats["verified"]
+        return {
+            **_stats,
+            "pending": _pending,
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+            "avg_seconds": _stats["total_seconds"] / calls if calls else 0.0,
+        }
+
+def shutdown_password_executor() -> None:
+    """Stop the bcrypt pool (called on application shutdown)"""
+    _executor.shutdown(wait=False, cancel_futures=True)
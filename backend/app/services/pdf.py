@@ -5,9 +5,45 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from typing import Iterable, Dict, Any, Optional
+from typing import Iterable, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 import os
+import time
+
+from app.core.config import settings
+
+# Bump whenever the claim report layout changes so cached reports are re-rendered
+REPORT_TEMPLATE_VERSION = "1"
+
+@lru_cache(maxsize=1)
+def get_report_styles() -> Tuple[Any, ParagraphStyle, ParagraphStyle]:
+    """Build the report stylesheet once per process (styles are never mutated after this)"""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=30,
+        alignment=1,  # Center alignment
+        textColor=colors.darkblue
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        textColor=colors.darkblue
+    )
+    return styles, title_style, heading_style
+
+def submission_lines(s: dict) -> Tuple[str, ...]:
+    """The text lines one submission takes up in the submissions report"""
+    line1 = f"#{s['id']} | {s['full_name']} | {s['email']}"
+    line2 = f"Notes: {s.get('notes','')}"
+    line3 = f"Geo: lat={s.get('latitude')} lon={s.get('longitude')} acc={s.get('geo_accuracy_m')}m at {s.get('captured_at')}"
+    return tuple(line[:110] for line in (line1, line2, line3, " "))
 
 def generate_submissions_pdf(submissions: Iterable[dict]) -> BytesIO:
     """Generate PDF report for form submissions (legacy function)"""
@@ -19,11 +55,8 @@ def generate_submissions_pdf(submissions: Iterable[dict]) -> BytesIO:
     p.setFont("Helvetica", 9)
 
     for s in submissions:
-        line1 = f"#{s['id']} | {s['full_name']} | {s['email']}"
-        line2 = f"Notes: {s.get('notes','')}"
-        line3 = f"Geo: lat={s.get('latitude')} lon={s.get('longitude')} acc={s.get('geo_accuracy_m')}m at {s.get('captured_at')}"
-        for line in (line1, line2, line3, " "):
-            p.drawString(40, y, line[:110])
+        for line in submission_lines(s):
+            p.drawString(40, y, line)
             y -= 16
             if y < 60:
                 p.showPage(); p.setFont("Helvetica", 9); y = 820
@@ -46,23 +79,7 @@ def generate_claim_verification_report(
     elements = []
     
     # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=1,  # Center alignment
-        textColor=colors.darkblue
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=colors.darkblue
-    )
+    styles, title_style, heading_style = get_report_styles()
     
     # Title
     title = Paragraph("VerifyCall - Claim Verification Report", title_style)
@@ -252,7 +269,7 @@ def generate_claim_verification_report(
     buffer.seek(0)
     return buffer
 
-def save_pdf_to_file(pdf_buffer: BytesIO, filename: str) -> str:
+def save_pdf_to_file(pdf_buffer: BytesIO | bytes, filename: str) -> str:
     """Save PDF buffer to file and return the file path"""
     # Create reports directory if it doesn't exist
     reports_dir = "reports"
@@ -261,6 +278,36 @@ def save_pdf_to_file(pdf_buffer: BytesIO, filename: str) -> str:
     file_path = os.path.join(reports_dir, filename)
     
     with open(file_path, 'wb') as f:
-        f.write(pdf_buffer.getvalue())
+        f.write(pdf_buffer if isinstance(pdf_buffer, bytes) else pdf_buffer.getvalue())
     
+    prune_reports_dir(reports_dir)
     return file_path
+
+def prune_reports_dir(reports_dir: str = "reports") -> int:
+    """
+    Apply the local retention policy to saved reports: delete files older
+    than REPORTS_RETENTION_DAYS, then the oldest ones until the directory
+    fits REPORTS_MAX_BYTES. Subdirectories (the report cache) are left alone.
+    Returns the number of files removed.
+    """
+    try:
+        with os.scandir(reports_dir) as it:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in it if e.is_file() and e.name.endswith(".pdf")]
+    except FileNotFoundError:
+        return 0
+    
+    removed = 0
+    cutoff = time.time() - settings.REPORTS_RETENTION_DAYS * 86400
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in sorted(files):
+        too_old = settings.REPORTS_RETENTION_DAYS > 0 and mtime < cutoff
+        too_big = settings.REPORTS_MAX_BYTES > 0 and total > settings.REPORTS_MAX_BYTES
+        if not (too_old or too_big):
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
@@ -0,0 +1,152 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots: Optional[asyncio.Semaphore] = None
+
+_stats_lock = threading.Lock()
+_in_flight = 0
+_stats: Dict[str, Any] = {
+    "rendered": 0,
+    "failed": 0,
+    "total_render_seconds": 0.0,
+    "max_render_seconds": 0.0,
+    "total_wait_seconds": 0.0,
+}
+
+# --- worker side ---------------------------------------------------------
+
+def _warm_worker() -> None:
+    """Process initializer: import ReportLab and build the fonts/stylesheet up front"""
+    from reportlab.pdfbase import pdfmetrics
+    from app.services.pdf import get_report_styles
+
+    for font in ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique"):
+        pdfmetrics.getFont(font)
+    get_report_styles()
+
+def _noop() -> None:
+    return None
+
+def _render_submissions(rows: list) -> Tuple[bytes, float]:
+    from app.services.pdf import generate_submissions_pdf
+
+    started = time.perf_counter()
+    pdf_bytes = generate_submissions_pdf(rows).getvalue()
+    return pdf_bytes, time.perf_counter() - started
+
+def _render_claim_report(
+    claim_data: Dict[str, Any],
+    meeting_data: Dict[str, Any],
+    recording_data: Optional[Dict[str, Any]],
+    form_data: Optional[Dict[str, Any]],
+) -> Tuple[bytes, float]:
+    from app.services.pdf import generate_claim_verification_report
+
+    started = time.perf_counter()
+    pdf_bytes = generate_claim_verification_report(
+        claim_data=claim_data,
+        meeting_data=meeting_data,
+        recording_data=recording_data,
+        form_data=form_data,
+    ).getvalue()
+    return pdf_bytes, time.perf_counter() - started
+
+# --- caller side ---------------------------------------------------------
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Get the process pool used for ReportLab renders"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: forking a process that already runs threads and an event loop isn't safe
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.PDF_RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+    return _executor
+
+async def _render(func, *args) -> bytes:
+    """Run a render in the pool; at most workers + PDF_RENDER_MAX_QUEUE renders are submitted at once"""
+    global _slots, _in_flight
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.PDF_RENDER_WORKERS + settings.PDF_RENDER_MAX_QUEUE)
+
+    queued_at = time.perf_counter()
+    async with _slots:
+        with _stats_lock:
+            _in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            pdf_bytes, render_seconds = await loop.run_in_executor(get_pdf_executor(), func, *args)
+        except Exception:
+            with _stats_lock:
+                _stats["failed"] += 1
+            raise
+        finally:
+            with _stats_lock:
+                _in_flight -= 1
+
+    wait_seconds = time.perf_counter() - queued_at - render_seconds
+    with _stats_lock:
+        _stats["rendered"] += 1
+        _stats["total_render_seconds"] += render_seconds
+        _stats["max_render_seconds"] = max(_stats["max_render_seconds"], render_seconds)
+        _stats["total_wait_seconds"] += max(0.0, wait_seconds)
+    return pdf_bytes
+
+async def render_submissions_pdf(rows: Iterable[dict]) -> bytes:
+    """Render the form submissions report in the PDF pool"""
+    return await _render(_render_submissions, list(rows))
+
+async def render_claim_report(
+    claim_data: Dict[str, Any],
+    meeting_data: Dict[str, Any],
+    recording_data: Optional[Dict[str, Any]] = None,
+    form_data: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """Render a claim verification report in the PDF pool"""
+    return await _render(_render_claim_report, claim_data, meeting_data, recording_data, form_data)
+
+async def warm_pdf_executor() -> None:
+    """Start every worker process now so the first reports don't pay for spawn and ReportLab imports"""
+    loop = asyncio.get_running_loop()
+    executor = get_pdf_executor()
+    try:
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _noop) for _ in range(settings.PDF_RENDER_WORKERS)
+        ))
+    except Exception as e:
+        logger.warning(f"Could not warm the PDF render pool: {str(e)}")
+
+def pdf_render_stats() -> Dict[str, Any]:
+    """Snapshot of render pool metrics (in-flight renders, counts, timings)"""
+    with _stats_lock:
+        rendered = _stats["rendered"]
+        return {
+            **_stats,
+            "in_flight": _in_flight,
+            "workers": settings.PDF_RENDER_WORKERS,
+            "max_queue": settings.PDF_RENDER_MAX_QUEUE,
+            "avg_render_seconds": _stats["total_render_seconds"] / rendered if rendered else 0.0,
+            "avg_wait_seconds": _stats["total_wait_seconds"] / rendered if rendered else 0.0,
+        }
+
+def shutdown_pdf_executor() -> None:
+    """Stop the render processes (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import zlib
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models import FormSubmission
+from app.db.session import AsyncSessionLocal
+from app.services.pdf import submission_lines
+from app.services.submissions import submission_filters, submission_row
+
+# A4 in points, same page size as generate_submissions_pdf
+PAGE_WIDTH = 595.2756
+PAGE_HEIGHT = 841.8898
+
+# (x, y, font size, text)
+TextLine = Tuple[float, float, int, str]
+
+def _pdf_string(text: str) -> bytes:
+    """Encode text as a PDF literal string for a WinAnsi-encoded standard font"""
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+class StreamingPDFWriter:
+    """
+    Minimal PDF writer that emits each page as soon as it is laid out.
+
+    Only the byte offsets of written objects and the page object numbers are
+    kept in memory, so the document can be arbitrarily long. Text uses the
+    built-in Helvetica font (nothing is embedded).
+
+    Object 1 is the catalog, 2 the page tree and 3 the font; the page tree
+    is written last, once every page is known.
+    """
+
+    def __init__(self):
+        self._offset = 0
+        self._offsets: Dict[int, int] = {}
+        self._next_object = 4
+        self._pages: List[int] = []
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        return data
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        self._offsets[number] = self._offset
+        return self._emit(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _allocate(self) -> int:
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def begin(self) -> bytes:
+        header = self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        font = self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        return header + font
+
+    def page(self, lines: List[TextLine]) -> bytes:
+        """Write one page of text lines and return its bytes"""
+        ops = [b"BT"]
+        for x, y, size, text in lines:
+            ops.append(b"/F1 %d Tf 1 0 0 1 %.2f %.2f Tm %s Tj" % (size, x, y, _pdf_string(text)))
+        ops.append(b"ET")
+        content = zlib.compress(b"\n".join(ops))
+
+        content_number = self._allocate()
+        page_number = self._allocate()
+        self._pages.append(page_number)
+        return self._object(
+            content_number,
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream",
+        ) + self._object(
+            page_number,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.4f %.4f] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_number),
+        )
+
+    def finish(self) -> bytes:
+        """Write the page tree, catalog, cross-reference table and trailer"""
+        kids = b" ".join(b"%d 0 R" % n for n in self._pages)
+        out = self._object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages)))
+        out += self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_offset = self._offset
+        size = self._next_object
+        xref = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for number in range(1, size):
+            xref.append(b"%010d 00000 n \n" % self._offsets[number])
+        out += self._emit(b"".join(xref))
+        out += self._emit(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset))
+        return out
+
+async def stream_submissions_pdf(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the submissions report as PDF bytes, page by page.
+
+    Rows come from a server-side cursor (session.stream) SUBMISSIONS_STREAM_CHUNK
+    at a time and are laid out like generate_submissions_pdf, so memory stays
+    flat however many submissions there are. Opens its own session because it
+    outlives the request handler.
+    """
+    writer = StreamingPDFWriter()
+    yield writer.begin()
+
+    lines: List[TextLine] = [(40, 840, 11, "Form Submissions Report")]
+    y = 820
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            select(FormSubmission)
+            .where(*submission_filters(since, until))
+            .order_by(FormSubmission.id)
+            .execution_options(yield_per=settings.SUBMISSIONS_STREAM_CHUNK)
+        )
+        async for partition in result.scalars().partitions():
+            pages = []
+            for submission in partition:
+                for line in submission_lines(submission_row(submission)):
+                    lines.append((40, y, 9, line))
+                    y -= 16
+                    if y < 60:
+                        pages.append(writer.page(lines))
+                        lines = []
+                        y = 820
+            if pages:
+                yield b"".join(pages)
+
+    if lines or not writer._pages:
+        yield writer.page(lines)
+    yield writer.finish()
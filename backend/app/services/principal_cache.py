@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+import hashlib
+import threading
+import time
+
+from app.core.config import settings
+from app.db.models import User
+
+# (user id, token fingerprint) -> (monotonic expiry, user snapshot)
+_principals: "OrderedDict[Tuple[int, str], Tuple[float, User]]" = OrderedDict()
+# user id -> cache keys, so a user can be invalidated without scanning
+_keys_by_user: Dict[int, Set[Tuple[int, str]]] = {}
+# token fingerprint -> unix time the token expires (no point remembering it longer)
+_revoked: Dict[str, float] = {}
+_lock = threading.Lock()
+
+def token_fingerprint(token: str) -> str:
+    """Stable key for a token, so raw bearer tokens are never kept in memory"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _snapshot(user: User) -> User:
+    # Detached copy: safe to hand out across sessions, and without the password hash
+    return User(id=user.id, email=user.email, created_at=user.created_at)
+
+def _drop(key: Tuple[int, str]) -> None:
+    _principals.pop(key, None)
+    keys = _keys_by_user.get(key[0])
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _keys_by_user[key[0]]
+
+def get_cached_principal(user_id: int, fingerprint: str) -> Optional[User]:
+    """Return the cached user for this token, or None on miss/expiry"""
+    key = (user_id, fingerprint)
+    with _lock:
+        entry = _principals.get(key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            _drop(key)
+            return None
+        _principals.move_to_end(key)
+        return user
+
+def cache_principal(user_id: int, fingerprint: str, user: User) -> None:
+    """Remember the user behind a token for PRINCIPAL_CACHE_TTL seconds"""
+    if settings.PRINCIPAL_CACHE_TTL <= 0:
+        return
+    key = (user_id, fingerprint)
+    with _lock:
+        _principals[key] = (time.monotonic() + settings.PRINCIPAL_CACHE_TTL, _snapshot(user))
+        _principals.move_to_end(key)
+        _keys_by_user.setdefault(user_id, set()).add(key)
+        while len(_principals) > settings.PRINCIPAL_CACHE_SIZE:
+            oldest = next(iter(_principals))
+            _drop(oldest)
+
+def invalidate_user(user_id: int) -> None:
+    """Forget every cached token for a user (call after the user record changes)"""
+    with _lock:
+        for key in list(_keys_by_user.get(user_id, ())):
+            _drop(key)
+
+def revoke_token(fingerprint: str, expires_at: float) -> None:
+    """Reject a token until it expires on its own (logout)"""
+    now = time.time()
+    with _lock:
+        for revoked, exp in list(_revoked.items()):
+            if exp < now:
+                del _revoked[revoked]
+        _revoked[fingerprint] = expires_at
+        for key in [k for k in _principals if k[1] == fingerprint]:
+            _drop(key)
+
+def is_token_revoked(fingerprint: str) -> bool:
+    with _lock:
+        return fingerprint in _revoked
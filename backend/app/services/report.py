@@ -1,22 +1,168 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Iterable, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import aliased
 from datetime import datetime
+import asyncio
 import logging
 
+from app.core.config import settings
 from app.db.models import Claim, Meeting, Recording, FormSubmission
-from app.services.pdf import generate_claim_verification_report, save_pdf_to_file
-from app.services.emailer import send_claim_verification_email
-from app.services.s3 import upload_file_to_s3, s3_key_for_recording
+from app.db.session import AsyncSessionLocal
+from app.services.pdf import save_pdf_to_file
+from app.services.pdf_executor import render_claim_report
+from app.services.report_cache import (
+    report_cache_key,
+    get_cached_report,
+    put_cached_report,
+    cached_report_s3_url,
+    s3_key_for_cached_report,
+    cache_path,
+    disk_cache_enabled,
+)
+from app.services.emailer import (
+    create_claim_verification_email_html,
+    create_claim_verification_email_text,
+    claim_verification_email_subject,
+    claim_verification_pdf_filename,
+    should_link_attachment,
+)
+from app.services.email_outbox import enqueue_email
+from app.services.s3 import generate_presigned_url
+from app.services.s3_multipart import run_in_s3_executor
+from app.services.jobs import job_handler, JobContext, PermanentJobError
 
 logger = logging.getLogger(__name__)
 
+# (claim_data, meeting_data, recording_data) as handed to the PDF renderer
+ReportInputs = Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+def _report_inputs(
+    claim: Claim,
+    meeting: Optional[Meeting],
+    recording: Optional[Recording]
+) -> ReportInputs:
+    """Convert ORM rows to dictionaries for PDF generation"""
+    claim_data = {
+        'id': claim.id,
+        'claim_number': claim.claim_number,
+        'patient_mobile': claim.patient_mobile,
+        'hospital_city': claim.hospital_city,
+        'hospital_state': claim.hospital_state,
+        'language': claim.language,
+        'status': claim.status,
+        'created_at': claim.created_at.strftime('%Y-%m-%d %H:%M:%S') if claim.created_at else 'N/A'
+    }
+    
+    meeting_data = None
+    if meeting:
+        meeting_data = {
+            'id': meeting.id,
+            'session_id': meeting.session_id,
+            'room_name': meeting.room_name,
+            'patient_name': meeting.patient_name,
+            'procedure': meeting.procedure,
+            'status': meeting.status,
+            'created_at': meeting.created_at.strftime('%Y-%m-%d %H:%M:%S') if meeting.created_at else 'N/A'
+        }
+    
+    recording_data = None
+    if recording:
+        recording_data = {
+            'id': recording.id,
+            's3_key': recording.s3_key,
+            's3_url': recording.s3_url,
+            'mime_type': recording.mime_type,
+            'duration_sec': recording.duration_sec,
+            'latitude': recording.latitude,
+            'longitude': recording.longitude,
+            'geo_accuracy_m': recording.geo_accuracy_m,
+            'created_at': recording.created_at.strftime('%Y-%m-%d %H:%M:%S') if recording.created_at else 'N/A'
+        }
+    
+    return claim_data, meeting_data, recording_data
+
 class ReportService:
     """Service for generating and sending claim verification reports"""
     
     def __init__(self, session: AsyncSession):
         self.session = session
     
+    async def load_claim_report_data_batch(
+        self,
+        claim_ids: Iterable[int]
+    ) -> Dict[int, ReportInputs]:
+        """
+        Load report inputs for many claims in one round trip.
+
+        Each claim is joined to its latest meeting and that meeting's latest
+        recording, picked with ROW_NUMBER() windows. Claims that don't exist
+        are left out; a claim without meetings maps to (claim_data, None, None).
+        """
+        claim_ids = list(claim_ids)
+        if not claim_ids:
+            return {}
+        
+        ranked_meetings = (
+            select(
+                Meeting,
+                func.row_number().over(
+                    partition_by=Meeting.claim_id,
+                    order_by=(Meeting.created_at.desc(), Meeting.id.desc())
+                ).label('rn')
+            )
+            .where(Meeting.claim_id.in_(claim_ids))
+            .subquery()
+        )
+        ranked_recordings = (
+            select(
+                Recording,
+                func.row_number().over(
+                    partition_by=Recording.meeting_id,
+                    order_by=(Recording.created_at.desc(), Recording.id.desc())
+                ).label('rn')
+            )
+            .where(Recording.meeting_id.in_(select(Meeting.id).where(Meeting.claim_id.in_(claim_ids))))
+            .subquery()
+        )
+        latest_meeting = aliased(Meeting, ranked_meetings)
+        latest_recording = aliased(Recording, ranked_recordings)
+        
+        result = await self.session.execute(
+            select(Claim, latest_meeting, latest_recording)
+            .outerjoin(
+                latest_meeting,
+                and_(latest_meeting.claim_id == Claim.id, ranked_meetings.c.rn == 1)
+            )
+            .outerjoin(
+                latest_recording,
+                and_(latest_recording.meeting_id == latest_meeting.id, ranked_recordings.c.rn == 1)
+            )
+            .where(Claim.id.in_(claim_ids))
+        )
+        
+        return {
+            claim.id: _report_inputs(claim, meeting, recording)
+            for claim, meeting, recording in result.all()
+        }
+    
+    async def load_claim_report_data(
+        self,
+        claim_id: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Load the claim, latest meeting and latest recording as plain dicts for the report"""
+        
+        inputs = (await self.load_claim_report_data_batch([claim_id])).get(claim_id)
+        
+        if not inputs:
+            raise ValueError(f"Claim with ID {claim_id} not found")
+        
+        claim_data, meeting_data, recording_data = inputs
+        if not meeting_data:
+            raise ValueError(f"No meeting found for claim {claim_data['claim_number']}")
+        
+        return claim_data, meeting_data, recording_data
+    
     async def generate_and_send_claim_report(
         self,
         claim_id: int,
@@ -26,110 +172,8 @@ class ReportService:
         """Generate comprehensive claim verification report and send via email"""
         
         try:
-            # Get claim data
-            claim_result = await self.session.execute(
-                select(Claim).where(Claim.id == claim_id)
-            )
-            claim = claim_result.scalar_one_or_none()
-            
-            if not claim:
-                raise ValueError(f"Claim with ID {claim_id} not found")
-            
-            # Get meeting data
-            meeting_result = await self.session.execute(
-                select(Meeting).where(Meeting.claim_id == claim_id).order_by(Meeting.created_at.desc())
-            )
-            meeting = meeting_result.scalar_one_or_none()
-            
-            if not meeting:
-                raise ValueError(f"No meeting found for claim {claim.claim_number}")
-            
-            # Get recording data (if available)
-            recording = None
-            if meeting:
-                recording_result = await self.session.execute(
-                    select(Recording).where(Recording.meeting_id == meeting.id).order_by(Recording.created_at.desc())
-                )
-                recording = recording_result.scalar_one_or_none()
-            
-            # Convert to dictionaries for PDF generation
-            claim_data = {
-                'id': claim.id,
-                'claim_number': claim.claim_number,
-                'patient_mobile': claim.patient_mobile,
-                'hospital_city': claim.hospital_city,
-                'hospital_state': claim.hospital_state,
-                'language': claim.language,
-                'status': claim.status,
-                'created_at': claim.created_at.strftime('%Y-%m-%d %H:%M:%S') if claim.created_at else 'N/A'
-            }
-            
-            meeting_data = {
-                'id': meeting.id,
-                'session_id': meeting.session_id,
-                'room_name': meeting.room_name,
-                'patient_name': meeting.patient_name,
-                'procedure': meeting.procedure,
-                'status': meeting.status,
-                'created_at': meeting.created_at.strftime('%Y-%m-%d %H:%M:%S') if meeting.created_at else 'N/A'
-            }
-            
-            recording_data = None
-            if recording:
-                recording_data = {
-                    'id': recording.id,
-                    's3_key': recording.s3_key,
-                    's3_url': recording.s3_url,
-                    'mime_type': recording.mime_type,
-                    'duration_sec': recording.duration_sec,
-                    'latitude': recording.latitude,
-                    'longitude': recording.longitude,
-                    'geo_accuracy_m': recording.geo_accuracy_m,
-                    'created_at': recording.created_at.strftime('%Y-%m-%d %H:%M:%S') if recording.created_at else 'N/A'
-                }
-            
-            # Generate PDF report
-            pdf_buffer = generate_claim_verification_report(
-                claim_data=claim_data,
-                meeting_data=meeting_data,
-                recording_data=recording_data,
-                form_data=form_data
-            )
-            
-            # Save PDF to file (optional - for local storage)
-            pdf_filename = f"claim_verification_{claim.claim_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf_file_path = save_pdf_to_file(pdf_buffer, pdf_filename)
-            
-            # Send email with PDF attachment
-            pdf_bytes = pdf_buffer.getvalue()
-            email_sent = send_claim_verification_email(
-                claim_data=claim_data,
-                meeting_data=meeting_data,
-                pdf_bytes=pdf_bytes,
-                recipient_email=recipient_email,
-                recording_data=recording_data
-            )
-            
-            # Upload PDF to S3 (optional)
-            s3_url = None
-            try:
-                s3_key = s3_key_for_recording(pdf_filename)
-                s3_url = upload_file_to_s3(pdf_file_path, s3_key, "application/pdf")
-                logger.info(f"PDF report uploaded to S3: {s3_url}")
-            except Exception as e:
-                logger.warning(f"Failed to upload PDF to S3: {str(e)}")
-            
-            return {
-                'success': True,
-                'claim_number': claim.claim_number,
-                'report_generated': True,
-                'email_sent': email_sent,
-                'pdf_file_path': pdf_file_path,
-                's3_url': s3_url,
-                'recipient_email': recipient_email,
-                'verification_status': 'COMPLETED' if recording_data else 'PENDING',
-                'message': 'Claim verification report generated and sent successfully'
-            }
+            claim_data, meeting_data, recording_data = await self.load_claim_report_data(claim_id)
+            return await deliver_claim_report(claim_data, meeting_data, recording_data, recipient_email, form_data)
             
         except Exception as e:
             logger.error(f"Failed to generate claim report: {str(e)}")
@@ -143,34 +187,82 @@ class ReportService:
         """Get comprehensive summary of claim verification status"""
         
         try:
-            # Get claim
-            claim_result = await self.session.execute(
-                select(Claim).where(Claim.id == claim_id)
+            # Counts, flags and the latest meeting/recording all come back in one round trip
+            meetings_count = (
+                select(func.count(Meeting.id))
+                .where(Meeting.claim_id == Claim.id)
+                .correlate(Claim)
+                .scalar_subquery()
             )
-            claim = claim_result.scalar_one_or_none()
-            
-            if not claim:
-                return {'success': False, 'error': 'Claim not found'}
-            
-            # Get meetings
-            meetings_result = await self.session.execute(
-                select(Meeting).where(Meeting.claim_id == claim_id).order_by(Meeting.created_at.desc())
+            completed_meetings = (
+                select(func.count(Meeting.id))
+                .where(Meeting.claim_id == Claim.id, Meeting.status == 'completed')
+                .correlate(Claim)
+                .scalar_subquery()
+            )
+            recordings_count = (
+                select(func.count(Recording.id))
+                .join(Meeting, Recording.meeting_id == Meeting.id)
+                .where(Meeting.claim_id == Claim.id)
+                .correlate(Claim)
+                .scalar_subquery()
+            )
+            geo_recordings = (
+                select(func.count(Recording.id))
+                .join(Meeting, Recording.meeting_id == Meeting.id)
+                .where(
+                    Meeting.claim_id == Claim.id,
+                    Recording.latitude.is_not(None),
+                    Recording.longitude.is_not(None)
+                )
+                .correlate(Claim)
+                .scalar_subquery()
+            )
+            latest_meeting_id = (
+                select(Meeting.id)
+                .where(Meeting.claim_id == Claim.id)
+                .order_by(Meeting.created_at.desc(), Meeting.id.desc())
+                .limit(1)
+                .correlate(Claim)
+                .scalar_subquery()
+            )
+            latest_recording_id = (
+                select(Recording.id)
+                .join(Meeting, Recording.meeting_id == Meeting.id)
+                .where(Meeting.claim_id == Claim.id)
+                .order_by(Recording.created_at.desc(), Recording.id.desc())
+                .limit(1)
+                .correlate(Claim)
+                .scalar_subquery()
             )
-            meetings = meetings_result.scalars().all()
             
-            # Get recordings
-            recordings = []
-            for meeting in meetings:
-                recording_result = await self.session.execute(
-                    select(Recording).where(Recording.meeting_id == meeting.id)
+            latest_meeting = aliased(Meeting)
+            latest_recording = aliased(Recording)
+            result = await self.session.execute(
+                select(
+                    Claim,
+                    meetings_count,
+                    completed_meetings,
+                    recordings_count,
+                    geo_recordings,
+                    latest_meeting,
+                    latest_recording
                 )
-                meeting_recordings = recording_result.scalars().all()
-                recordings.extend(meeting_recordings)
+                .outerjoin(latest_meeting, latest_meeting.id == latest_meeting_id)
+                .outerjoin(latest_recording, latest_recording.id == latest_recording_id)
+                .where(Claim.id == claim_id)
+            )
+            row = result.one_or_none()
+            
+            if not row:
+                return {'success': False, 'error': 'Claim not found'}
+            
+            claim, n_meetings, n_completed, n_recordings, n_geo, meeting, recording = row
             
             # Calculate verification status
-            has_completed_meeting = any(m.status == 'completed' for m in meetings)
-            has_recording = len(recordings) > 0
-            has_geolocation = any(r.latitude and r.longitude for r in recordings)
+            has_completed_meeting = n_completed > 0
+            has_recording = n_recordings > 0
+            has_geolocation = n_geo > 0
             
             verification_status = 'VERIFIED' if (has_completed_meeting and has_recording) else 'PENDING'
             
@@ -186,23 +278,23 @@ class ReportService:
                     'status': claim.status,
                     'created_at': claim.created_at
                 },
-                'meetings_count': len(meetings),
-                'recordings_count': len(recordings),
+                'meetings_count': n_meetings,
+                'recordings_count': n_recordings,
                 'verification_status': verification_status,
                 'has_completed_meeting': has_completed_meeting,
                 'has_recording': has_recording,
                 'has_geolocation': has_geolocation,
                 'latest_meeting': {
-                    'session_id': meetings[0].session_id,
-                    'status': meetings[0].status,
-                    'created_at': meetings[0].created_at
-                } if meetings else None,
+                    'session_id': meeting.session_id,
+                    'status': meeting.status,
+                    'created_at': meeting.created_at
+                } if meeting else None,
                 'latest_recording': {
-                    'id': recordings[0].id,
-                    's3_url': recordings[0].s3_url,
-                    'duration_sec': recordings[0].duration_sec,
-                    'created_at': recordings[0].created_at
-                } if recordings else None
+                    'id': recording.id,
+                    's3_url': recording.s3_url,
+                    'duration_sec': recording.duration_sec,
+                    'created_at': recording.created_at
+                } if recording else None
             }
             
         except Exception as e:
@@ -215,3 +307,175 @@ class ReportService:
 async def create_report_service(session: AsyncSession) -> ReportService:
     """Factory function to create ReportService instance"""
     return ReportService(session)
+
+async def deliver_claim_report(
+    claim_data: Dict[str, Any],
+    meeting_data: Dict[str, Any],
+    recording_data: Optional[Dict[str, Any]],
+    recipient_email: str,
+    form_data: Optional[Dict[str, Any]] = None,
+    ctx: Optional[JobContext] = None
+) -> Dict[str, Any]:
+    """
+    Render, store, email and upload a claim report.
+
+    Needs no database session. Reports with unchanged inputs come from the
+    report cache; otherwise ReportLab renders in the PDF process pool. The
+    email goes through the outbox and boto3 calls run on the S3 executor. A
+    failed upload is recorded in the result instead of failing the report.
+    """
+    
+    async def progress(pct: int) -> None:
+        if ctx is not None:
+            await ctx.set_progress(pct)
+    
+    claim_number = claim_data.get('claim_number')
+    
+    # Identical inputs produce an identical report, so serve it from the cache when we can
+    digest = report_cache_key(claim_data, meeting_data, recording_data, form_data)
+    pdf_bytes = await asyncio.to_thread(get_cached_report, digest)
+    cache_hit = pdf_bytes is not None
+    if not cache_hit:
+        # Generate PDF report in the render process pool
+        pdf_bytes = await render_claim_report(claim_data, meeting_data, recording_data, form_data)
+    await progress(40)
+    
+    # Keep a local copy if configured (the cache entry doubles as it when the disk cache is on)
+    pdf_filename = f"claim_verification_{claim_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    pdf_file_path = None
+    if disk_cache_enabled():
+        pdf_file_path = cache_path(digest)
+        if not cache_hit:
+            await asyncio.to_thread(put_cached_report, digest, pdf_bytes)
+    elif settings.REPORTS_KEEP_LOCAL:
+        pdf_file_path = await asyncio.to_thread(save_pdf_to_file, pdf_bytes, pdf_filename)
+    await progress(50)
+    
+    # Upload PDF to S3 (optional) under its content-addressed key, straight from
+    # memory; a report that is already there is not uploaded again
+    s3_url = None
+    s3_key = s3_key_for_cached_report(digest)
+    if settings.S3_BUCKET:
+        try:
+            s3_url = await run_in_s3_executor(cached_report_s3_url, digest, pdf_bytes)
+            logger.info(f"PDF report stored in S3: {s3_url}")
+        except Exception as e:
+            logger.warning(f"Failed to upload PDF to S3: {str(e)}")
+    await progress(70)
+    
+    # Large reports are linked (presigned, time-limited) rather than attached
+    report_url = None
+    if s3_url and should_link_attachment(len(pdf_bytes)):
+        try:
+            report_url = await run_in_s3_executor(generate_presigned_url, s3_key, settings.EMAIL_LINK_EXPIRY)
+        except Exception as e:
+            logger.warning(f"Failed to presign report link, attaching instead: {str(e)}")
+    
+    # Queue the email; the outbox dispatcher handles SMTP and retries
+    email_message_id = None
+    email_error = None
+    try:
+        async with AsyncSessionLocal() as session:
+            email_message_id = await enqueue_email(
+                session,
+                to_address=recipient_email,
+                subject=claim_verification_email_subject(claim_data),
+                text_body=create_claim_verification_email_text(claim_data, meeting_data, recording_data, report_url),
+                html_body=create_claim_verification_email_html(claim_data, meeting_data, recording_data, report_url),
+                attachment=None if report_url else pdf_bytes,
+                attachment_name=claim_verification_pdf_filename(claim_data)
+            )
+    except Exception as e:
+        email_error = str(e)
+        logger.error(f"Failed to queue claim report email for {claim_number}: {email_error}")
+    await progress(90)
+    
+    return {
+        'success': email_message_id is not None,
+        'claim_number': claim_number,
+        'report_generated': True,
+        'email_queued': email_message_id is not None,
+        'email_message_id': email_message_id,
+        'email_error': email_error,
+        'email_delivery': 'link' if report_url else 'attachment',
+        'pdf_file_path': pdf_file_path,
+        's3_url': s3_url,
+        'cached': cache_hit,
+        'recipient_email': recipient_email,
+        'verification_status': 'COMPLETED' if recording_data else 'PENDING',
+        'message': 'Claim verification report generated and queued for email' if email_message_id is not None
+                   else 'Claim verification report generated but the email could not be queued'
+    }
+
+async def generate_bulk_claim_reports(
+    claim_ids: Iterable[int],
+    recipient_email: str,
+    form_data: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Build and deliver reports for many claims, yielding each result as it finishes.
+
+    Claim data is loaded BULK_REPORT_BATCH_SIZE claims per query. Up to
+    BULK_REPORT_CONCURRENCY reports are in flight at once: they render in
+    the PDF pool, upload to S3 concurrently and reuse pooled SMTP sessions.
+    """
+    claim_ids = list(dict.fromkeys(claim_ids))
+    slots = asyncio.Semaphore(settings.BULK_REPORT_CONCURRENCY)
+    
+    async def run(claim_id: int, inputs: Optional[ReportInputs]) -> Dict[str, Any]:
+        if not inputs:
+            return {'claim_id': claim_id, 'success': False, 'error': f"Claim with ID {claim_id} not found"}
+        claim_data, meeting_data, recording_data = inputs
+        if not meeting_data:
+            return {
+                'claim_id': claim_id,
+                'claim_number': claim_data['claim_number'],
+                'success': False,
+                'error': f"No meeting found for claim {claim_data['claim_number']}"
+            }
+        async with slots:
+            try:
+                result = await deliver_claim_report(
+                    claim_data, meeting_data, recording_data, recipient_email, form_data
+                )
+            except Exception as e:
+                logger.error(f"Bulk report for claim {claim_id} failed: {str(e)}")
+                result = {'success': False, 'claim_number': claim_data['claim_number'], 'error': str(e)}
+        return {'claim_id': claim_id, **result}
+    
+    tasks: list[asyncio.Task] = []
+    try:
+        for start in range(0, len(claim_ids), settings.BULK_REPORT_BATCH_SIZE):
+            batch = claim_ids[start:start + settings.BULK_REPORT_BATCH_SIZE]
+            async with AsyncSessionLocal() as session:
+                batch_inputs = await ReportService(session).load_claim_report_data_batch(batch)
+            
+            tasks = [asyncio.create_task(run(claim_id, batch_inputs.get(claim_id))) for claim_id in batch]
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+    finally:
+        # The consumer may stop early (client disconnected)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+@job_handler("claim_report")
+async def claim_report_job(session: AsyncSession, payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """Background job: build and deliver one claim verification report"""
+    report_service = ReportService(session)
+    try:
+        claim_data, meeting_data, recording_data = await report_service.load_claim_report_data(payload["claim_id"])
+    except ValueError as e:
+        raise PermanentJobError(str(e))
+    # Don't hold a pooled connection through rendering, SMTP and S3
+    await session.close()
+    await ctx.set_progress(10)
+    
+    return await deliver_claim_report(
+        claim_data,
+        meeting_data,
+        recording_data,
+        payload["recipient_email"],
+        payload.get("form_data"),
+        ctx=ctx
+    )
@@ -0,0 +1,142 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.services.pdf import REPORT_TEMPLATE_VERSION
+from app.services.s3 import get_s3, generate_s3_url, upload_bytes_to_s3
+
+logger = logging.getLogger(__name__)
+
+# Keys that change without changing what the report shows
+_VOLATILE_KEYS = {"updated_at", "generated_at"}
+
+_evict_lock = threading.Lock()
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_stable(v) for v in value]
+    return value
+
+def report_cache_key(
+    claim_data: Dict[str, Any],
+    meeting_data: Dict[str, Any],
+    recording_data: Optional[Dict[str, Any]] = None,
+    form_data: Optional[Dict[str, Any]] = None,
+) -> str:
+    """sha256 of the canonical report inputs (and the template version)"""
+    canonical = json.dumps(
+        _stable({
+            "template": REPORT_TEMPLATE_VERSION,
+            "claim": claim_data,
+            "meeting": meeting_data,
+            "recording": recording_data,
+            "form": form_data or {},
+        }),
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def cache_path(digest: str) -> str:
+    return os.path.join(settings.REPORT_CACHE_DIR, f"{digest}.pdf")
+
+def s3_key_for_cached_report(digest: str) -> str:
+    return f"{settings.S3_PREFIX}reports/{digest}.pdf"
+
+def disk_cache_enabled() -> bool:
+    # REPORTS_KEEP_LOCAL=false means nothing is written under reports/, cache included
+    return settings.REPORTS_KEEP_LOCAL and settings.REPORT_CACHE_MAX_BYTES > 0
+
+def s3_cache_enabled() -> bool:
+    return settings.REPORT_CACHE_S3 and bool(settings.S3_BUCKET)
+
+def get_cached_report(digest: str) -> Optional[bytes]:
+    """Read a cached report from disk, falling back to S3; None on a miss"""
+    if disk_cache_enabled():
+        path = cache_path(digest)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            os.utime(path)  # mark as recently used for LRU eviction
+            return pdf_bytes
+        except FileNotFoundError:
+            pass
+
+    if s3_cache_enabled():
+        try:
+            obj = get_s3().get_object(Bucket=settings.S3_BUCKET, Key=s3_key_for_cached_report(digest))
+            pdf_bytes = obj["Body"].read()
+        except ClientError:
+            return None
+        if disk_cache_enabled():
+            _write_disk(digest, pdf_bytes)
+        return pdf_bytes
+
+    return None
+
+def put_cached_report(digest: str, pdf_bytes: bytes) -> Optional[str]:
+    """Store a freshly rendered report; returns its local path when the disk cache is on"""
+    if not disk_cache_enabled():
+        return None
+    return _write_disk(digest, pdf_bytes)
+
+def cached_report_s3_url(digest: str, pdf_bytes: bytes) -> str:
+    """
+    S3 URL of the content-addressed copy, uploading it only if it isn't
+    there yet, so a repeat request for the same report never re-uploads.
+    """
+    s3_key = s3_key_for_cached_report(digest)
+    try:
+        get_s3().head_object(Bucket=settings.S3_BUCKET, Key=s3_key)
+        return generate_s3_url(s3_key)
+    except ClientError:
+        pass
+    return upload_bytes_to_s3(pdf_bytes, s3_key, "application/pdf")
+
+def _write_disk(digest: str, pdf_bytes: bytes) -> str:
+    os.makedirs(settings.REPORT_CACHE_DIR, exist_ok=True)
+    path = cache_path(digest)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, path)  # atomic, so readers never see a partial file
+    _evict()
+    return path
+
+def _evict() -> None:
+    """Delete least recently used entries until the cache fits REPORT_CACHE_MAX_BYTES"""
+    with _evict_lock:
+        entries = []
+        total = 0
+        with os.scandir(settings.REPORT_CACHE_DIR) as it:
+            for entry in it:
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= settings.REPORT_CACHE_MAX_BYTES:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= settings.REPORT_CACHE_MAX_BYTES:
+                break
+        logger.info(f"Report cache trimmed to {total} bytes")
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from fastapi import Request
+from sqlalchemy import select, update, delete
+
+from app.core.config import settings
+from app.db.models import UploadSession, UploadPart, UploadSegment
+from app.db.session import AsyncSessionLocal
+from app.services.background import start_periodic_task
+from app.services.s3 import get_s3
+from app.services.s3_multipart import abort_multipart_upload, run_in_s3_executor
+
+logger = logging.getLogger(__name__)
+
+class ChunkTooLargeError(Exception):
+    """Raised when a chunk body exceeds the session's part size"""
+
+async def read_chunk(request: Request, limit: int) -> bytes:
+    """Read a request body, refusing to buffer more than `limit` bytes"""
+    chunk = bytearray()
+    async for data in request.stream():
+        chunk.extend(data)
+        if len(chunk) > limit:
+            raise ChunkTooLargeError(f"Chunk exceeds part size of {limit} bytes")
+    return bytes(chunk)
+
+def expected_part_count(upload: UploadSession) -> Optional[int]:
+    """Number of parts the upload will have, if the total size was declared"""
+    if not upload.total_size:
+        return None
+    return -(-upload.total_size // upload.part_size)
+
+def expected_part_size(upload: UploadSession, part_number: int) -> Optional[int]:
+    """Exact size part `part_number` must have, if the total size was declared"""
+    if not upload.total_size:
+        return None
+    return min(upload.part_size, upload.total_size - (part_number - 1) * upload.part_size)
+
+def received_offset(parts: Iterable[UploadPart]) -> int:
+    """Bytes received contiguously from the start of the file"""
+    offset = 0
+    expected = 1
+    for part in sorted(parts, key=lambda p: p.part_number):
+        if part.part_number != expected:
+            break
+        offset += part.size
+        expected += 1
+    return offset
+
+def missing_parts(upload: UploadSession, parts: Iterable[UploadPart]) -> Optional[List[int]]:
+    """Part numbers still to be sent, if the total size was declared"""
+    part_count = expected_part_count(upload)
+    if part_count is None:
+        return None
+    received = {p.part_number for p in parts}
+    return [n for n in range(1, part_count + 1) if n not in received]
+
+def upload_status(upload: UploadSession, parts: List[UploadPart]) -> Dict:
+    """Serialize an upload session for the status endpoint"""
+    return {
+        "upload_session_id": upload.id,
+        "status": upload.status,
+        "s3_key": upload.s3_key,
+        "part_size": upload.part_size,
+        "total_size": upload.total_size,
+        "received_bytes": sum(p.size for p in parts),
+        "next_offset": received_offset(parts),
+        "received_parts": sorted(p.part_number for p in parts),
+        "missing_parts": missing_parts(upload, parts),
+    }
+
+async def sweep_abandoned_uploads() -> int:
+    """
+    Abort active upload sessions idle for longer than RESUMABLE_UPLOAD_TTL.
+
+    The status flip is a conditional UPDATE, so when several replicas sweep
+    at once only one of them aborts each S3 multipart upload.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.RESUMABLE_UPLOAD_TTL)
+    aborted = 0
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(UploadSession).where(
+                UploadSession.status == "active",
+                UploadSession.updated_at < cutoff,
+            )
+        )
+        stale = result.scalars().all()
+
+        for upload in stale:
+            claimed = await session.execute(
+                update(UploadSession)
+                .where(UploadSession.id == upload.id, UploadSession.status == "active")
+                .values(status="aborted")
+            )
+            # Live uploads may still hold segments that never made a whole part
+            await session.execute(
+                delete(UploadSegment).where(UploadSegment.upload_session_id == upload.id)
+            )
+            await session.commit()
+            if claimed.rowcount != 1:
+                continue
+            await abort_multipart_upload(upload.s3_key, upload.upload_id)
+            aborted += 1
+
+        # Also clean up multipart uploads S3 still holds that no active session owns
+        # (e.g. presigned multipart uploads the browser never completed)
+        result = await session.execute(
+            select(UploadSession.upload_id).where(UploadSession.status == "active")
+        )
+        active_upload_ids = set(result.scalars().all())
+
+    if settings.S3_BUCKET:
+        aborted += await _abort_orphaned_s3_uploads(cutoff, active_upload_ids)
+
+    if aborted:
+        logger.info(f"Aborted {aborted} abandoned multipart upload(s)")
+    return aborted
+
+def _list_multipart_uploads() -> List[Dict]:
+    """Every in-progress multipart upload under S3_PREFIX (S3 returns 1000 per page)"""
+    paginator = get_s3().get_paginator("list_multipart_uploads")
+    uploads = []
+    for page in paginator.paginate(Bucket=settings.S3_BUCKET, Prefix=settings.S3_PREFIX):
+        uploads.extend(page.get("Uploads", []))
+    return uploads
+
+async def _abort_orphaned_s3_uploads(cutoff: datetime, active_upload_ids: set) -> int:
+    uploads = await run_in_s3_executor(_list_multipart_uploads)
+    aborted = 0
+    for item in uploads:
+        initiated = item["Initiated"].replace(tzinfo=None)
+        if initiated >= cutoff or item["UploadId"] in active_upload_ids:
+            continue
+        await abort_multipart_upload(item["Key"], item["UploadId"])
+        aborted += 1
+    return aborted
+
+def start_upload_sweeper() -> None:
+    """Schedule the abandoned upload sweeper (called on application startup)"""
+    start_periodic_task(
+        "resumable-upload-sweeper",
+        sweep_abandoned_uploads,
+        settings.RESUMABLE_UPLOAD_SWEEP_INTERVAL,
+    )
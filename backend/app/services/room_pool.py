@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import uuid4
+import logging
+import os
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Meeting
+from app.db.session import AsyncSessionLocal
+from app.services.background import start_background_task
+from app.services.jaas_tokens import mint_jaas_token
+
+logger = logging.getLogger(__name__)
+
+# Set when a claim drops the pool below the low-water mark
+_refill_requested: Optional[asyncio.Event] = None
+
+def build_meeting_url(room_name: str, token: str = "") -> str:
+    """Build a Jitsi/JaaS meeting URL, with the JWT appended when there is one"""
+    jitsi_domain = os.getenv("JITSI_DOMAIN", "meet.jit.si")
+    # Use HTTPS for public Jitsi, HTTP for local development
+    protocol = "https" if jitsi_domain == "meet.jit.si" else "http"
+    base_url = f"{protocol}://{jitsi_domain}"
+    if token:
+        return f"{base_url}/{room_name}?jwt={token}"
+    return f"{base_url}/{room_name}"
+
+def _pool_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.ROOM_POOL_ENTRY_TTL)
+
+def _reserved_meeting() -> Meeting:
+    return Meeting(
+        room_name=f"vc-{uuid4().hex[:12]}",
+        session_id=str(uuid4()),
+        status="reserved",
+    )
+
+def _moderator_url(room_name: str) -> str:
+    try:
+        moderator_token = mint_jaas_token(room_name, "Doctor", moderator=True)
+    except Exception as e:
+        logger.warning(f"Pooled room {room_name} has no moderator token: {str(e)}")
+        moderator_token = ""
+    return build_meeting_url(room_name, moderator_token)
+
+async def claim_pooled_room(
+    session: AsyncSession,
+    claim_id: Optional[int],
+    patient_name: Optional[str],
+    procedure: Optional[str],
+) -> Optional[Meeting]:
+    """
+    Take a reserved room from the pool and bind it to a claim.
+
+    The claim is a conditional UPDATE on status='reserved', so concurrent
+    handlers (on any replica) never get the same room. Returns None when the
+    pool is empty; the caller commits.
+    """
+    if settings.ROOM_POOL_SIZE <= 0:
+        return None
+
+    result = await session.execute(
+        select(Meeting.id, Meeting.room_name)
+        .where(Meeting.status == "reserved", Meeting.created_at > _pool_cutoff())
+        .order_by(Meeting.id)
+        .limit(5)
+    )
+    for meeting_id, room_name in result.all():
+        claimed = await session.execute(
+            update(Meeting)
+            .where(Meeting.id == meeting_id, Meeting.status == "reserved")
+            .values(
+                status="pending",
+                claim_id=claim_id,
+                patient_name=patient_name,
+                procedure=procedure,
+                # Minted at claim time so the moderator gets the full JAAS_TOKEN_TTL,
+                # same as an inline room (the parsed key is cached, so this is cheap)
+                room_url=_moderator_url(room_name),
+                created_at=datetime.utcnow(),
+            )
+        )
+        if claimed.rowcount == 1:
+            request_refill()
+            return await session.get(Meeting, meeting_id, populate_existing=True)
+
+    request_refill()
+    return None
+
+def request_refill() -> None:
+    """Wake the refill task early instead of waiting for the next interval"""
+    if _refill_requested is not None:
+        _refill_requested.set()
+
+async def refill_room_pool() -> int:
+    """Drop expired entries and top the pool back up once it falls below the low-water mark"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(Meeting).where(Meeting.status == "reserved", Meeting.created_at <= _pool_cutoff())
+        )
+        result = await session.execute(
+            select(func.count(Meeting.id)).where(Meeting.status == "reserved")
+        )
+        available = result.scalar_one()
+
+        if available >= settings.ROOM_POOL_LOW_WATER:
+            await session.commit()
+            return 0
+
+        missing = settings.ROOM_POOL_SIZE - available
+        session.add_all([_reserved_meeting() for _ in range(missing)])
+        await session.commit()
+        logger.info(f"Room pool refilled with {missing} rooms ({available} were available)")
+        return missing
+
+async def _run_refill_loop() -> None:
+    while True:
+        try:
+            await refill_room_pool()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Room pool refill failed: {str(e)}")
+        _refill_requested.clear()
+        try:
+            await asyncio.wait_for(_refill_requested.wait(), timeout=settings.ROOM_POOL_REFILL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+def start_room_pool() -> None:
+    """Start the background pool refill (called on application startup)"""
+    global _refill_requested
+    if settings.ROOM_POOL_SIZE <= 0:
+        return
+    _refill_requested = asyncio.Event()
+    start_background_task("room-pool-refill", _run_refill_loop())
@@ -6,11 +6,23 @@ from datetime import datetime
 import os
 import logging
 import json
+import threading
+import hashlib
+import hmac
+import time
+from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
-def get_s3():
-    """Get S3 client with proper configuration"""
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+# bucket name -> time.monotonic() of the last successful existence check
+_bucket_checked_at: dict[str, float] = {}
+_bucket_check_lock = threading.Lock()
+
+def _create_s3_client():
+    """Create an S3 client with connection pooling, retries and keep-alive"""
     if not all([settings.AWS_ACCESS_KEY_ID, settings.AWS_SECRET_ACCESS_KEY, settings.AWS_REGION]):
         raise ValueError("AWS credentials not properly configured")
 
@@ -21,7 +33,15 @@ def get_s3():
             region_name=settings.AWS_REGION,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            config=Config(signature_version="s3v4"),
+            config=Config(
+                signature_version="s3v4",
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={
+                    "mode": settings.S3_RETRY_MODE,
+                    "max_attempts": settings.S3_MAX_ATTEMPTS,
+                },
+                tcp_keepalive=settings.S3_TCP_KEEPALIVE,
+            ),
         )
         logger.info("S3 client created successfully")
         return s3_client
@@ -29,6 +49,27 @@ def get_s3():
         logger.error(f"Failed to create S3 client: {str(e)}")
         raise
 
+def get_s3():
+    """
+    Get the process-wide S3 client.
+
+    boto3 clients are thread-safe, so one client (and its urllib3 connection
+    pool) is shared by every request and executor thread. It is created lazily
+    on first use.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = _create_s3_client()
+    return _s3_client
+
+def reset_s3_client() -> None:
+    """Drop the shared client so the next get_s3() call builds a new one"""
+    global _s3_client
+    with _s3_client_lock:
+        _s3_client = None
+
 def s3_key_for_recording(filename: str) -> str:
     """Generate S3 key for recording file"""
     ts = datetime.utcnow().strftime("%Y/%m/%d/%H%M%S")
@@ -36,6 +77,14 @@ def s3_key_for_recording(filename: str) -> str:
     clean_filename = filename.replace(" ", "_").replace("(", "").replace(")", "")
     return f"{settings.S3_PREFIX}{ts}-{clean_filename}"
 
+def s3_key_for_live_recording(room_name: str, content_type: str, upload_session_id: str) -> str:
+    """Generate S3 key for a recording ingested live during the call"""
+    ts = datetime.utcnow().strftime("%Y/%m/%d/%H%M%S")
+    # "video/webm;codecs=vp8,opus" -> "webm"
+    extension = content_type.split(";")[0].split("/")[-1] or "webm"
+    # The upload session id keeps a second session in the same room from overwriting the first
+    return f"{settings.S3_PREFIX}live/{ts}-{room_name}-{upload_session_id}.{extension}"
+
 def s3_key_for_claim_file(claim_id: str, filename: str) -> str:
     """Generate S3 key for claim file using claim ID as folder and filename as object name"""
     # Clean filename to avoid issues
@@ -71,6 +120,58 @@ def generate_presigned_url(s3_key: str, expiration: int = 3600) -> str:
     except ClientError as e:
         raise Exception(f"Error generating presigned URL: {str(e)}")
 
+def generate_presigned_put_url(s3_key: str, content_type: str | None = None, expiration: int | None = None) -> str:
+    """Generate a presigned URL that lets a browser PUT an object directly to S3"""
+    params = {'Bucket': settings.S3_BUCKET, 'Key': s3_key}
+    if content_type:
+        # The browser must send the same Content-Type header or the signature won't match
+        params['ContentType'] = content_type
+    try:
+        return get_s3().generate_presigned_url(
+            'put_object',
+            Params=params,
+            ExpiresIn=expiration or settings.S3_PRESIGN_UPLOAD_EXPIRY
+        )
+    except ClientError as e:
+        raise Exception(f"Error generating presigned upload URL: {str(e)}")
+
+def generate_presigned_part_urls(s3_key: str, upload_id: str, part_count: int, expiration: int | None = None) -> list[dict]:
+    """Generate presigned upload_part URLs for parts 1..part_count of a multipart upload"""
+    s3_client = get_s3()
+    try:
+        return [
+            {
+                'part_number': part_number,
+                'url': s3_client.generate_presigned_url(
+                    'upload_part',
+                    Params={
+                        'Bucket': settings.S3_BUCKET,
+                        'Key': s3_key,
+                        'UploadId': upload_id,
+                        'PartNumber': part_number,
+                    },
+                    ExpiresIn=expiration or settings.S3_PRESIGN_UPLOAD_EXPIRY
+                ),
+            }
+            for part_number in range(1, part_count + 1)
+        ]
+    except ClientError as e:
+        raise Exception(f"Error generating presigned part URLs: {str(e)}")
+
+def sign_upload_token(*values: str) -> str:
+    """
+    HMAC over the values of an issued direct upload (room, key, upload id).
+
+    The completion callback must echo this token back, so clients can only
+    register Recording rows for keys the backend actually handed out.
+    """
+    message = "|".join(values).encode()
+    return hmac.new(settings.jwt_secret.encode(), message, hashlib.sha256).hexdigest()
+
+def verify_upload_token(token: str, *values: str) -> bool:
+    """Check a token produced by sign_upload_token"""
+    return hmac.compare_digest(token, sign_upload_token(*values))
+
 def ensure_bucket_exists(s3_client, bucket_name: str) -> None:
     """Ensure the S3 bucket exists, create it if it doesn't"""
     try:
@@ -126,20 +227,49 @@ def ensure_bucket_exists(s3_client, bucket_name: str) -> None:
             # Re-raise other errors
             raise
 
+def is_bucket_verified(bucket_name: str) -> bool:
+    """Whether the bucket was verified within the last S3_BUCKET_CHECK_TTL seconds"""
+    checked_at = _bucket_checked_at.get(bucket_name)
+    if checked_at is None:
+        return False
+    ttl = settings.S3_BUCKET_CHECK_TTL
+    return ttl <= 0 or time.monotonic() - checked_at < ttl
+
+def ensure_bucket_ready(s3_client, bucket_name: str) -> None:
+    """
+    Cached version of ensure_bucket_exists.
+
+    The HEAD (and possible create) only runs on first use, after the TTL has
+    expired, or after invalidate_bucket_check() was called because an upload
+    came back with NoSuchBucket.
+    """
+    if is_bucket_verified(bucket_name):
+        return
+    with _bucket_check_lock:
+        if is_bucket_verified(bucket_name):
+            return
+        ensure_bucket_exists(s3_client, bucket_name)
+        _bucket_checked_at[bucket_name] = time.monotonic()
+
+def invalidate_bucket_check(bucket_name: str) -> None:
+    """Forget that the bucket was verified so the next upload checks it again"""
+    if _bucket_checked_at.pop(bucket_name, None) is not None:
+        logger.warning(f"Bucket '{bucket_name}' check invalidated")
+
+def is_no_such_bucket_error(error: Exception) -> bool:
+    """Detect a NoSuchBucket error, including ones wrapped by the transfer manager"""
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in ('NoSuchBucket', '404')
+    return 'NoSuchBucket' in str(error)
+
 def upload_file_to_s3(file_path: str, s3_key: str, content_type: str = None) -> str:
     """Upload a file to S3 and return the URL"""
     try:
         logger.info(f"Uploading file {file_path} to S3 bucket {settings.S3_BUCKET} with key {s3_key}")
-        # Create an S3 client using credentials (matching the sample script pattern)
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        s3 = get_s3()
 
-        # Ensure bucket exists before uploading
-        ensure_bucket_exists(s3, settings.S3_BUCKET)
+        # Ensure bucket exists before uploading (cached after the first check)
+        ensure_bucket_ready(s3, settings.S3_BUCKET)
 
         # Upload the file (matching the sample script pattern)
         s3.upload_file(file_path, settings.S3_BUCKET, s3_key)
@@ -149,11 +279,15 @@ def upload_file_to_s3(file_path: str, s3_key: str, content_type: str = None) ->
         return generate_s3_url(s3_key)
 
     except ClientError as e:
+        if is_no_such_bucket_error(e):
+            invalidate_bucket_check(settings.S3_BUCKET)
         error_code = e.response['Error']['Code']
         error_message = e.response['Error']['Message']
         logger.error(f"S3 ClientError uploading file {file_path} to bucket {settings.S3_BUCKET} with key {s3_key}: {error_code} - {error_message}")
         raise Exception(f"S3 Error uploading file: {error_code} - {error_message}")
     except Exception as e:
+        if is_no_such_bucket_error(e):
+            invalidate_bucket_check(settings.S3_BUCKET)
         logger.error(f"Unexpected error uploading file {file_path} to S3: {str(e)}")
         raise Exception(f"Error uploading file: {e}")
 
@@ -161,16 +295,10 @@ def upload_fileobj_to_s3(file_obj, s3_key: str, content_type: str = None) -> str
     """Upload a file-like object to S3 and return the URL"""
     try:
         logger.info(f"Uploading file object to S3 bucket {settings.S3_BUCKET} with key {s3_key}")
-        # Create an S3 client using credentials
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        s3 = get_s3()
 
-        # Ensure bucket exists before uploading
-        ensure_bucket_exists(s3, settings.S3_BUCKET)
+        # Ensure bucket exists before uploading (cached after the first check)
+        ensure_bucket_ready(s3, settings.S3_BUCKET)
 
         # Upload the file object
         extra_args = {}
@@ -184,9 +312,40 @@ def upload_fileobj_to_s3(file_obj, s3_key: str, content_type: str = None) -> str
         return generate_s3_url(s3_key)
 
     except Exception as e:
+        if is_no_such_bucket_error(e):
+            invalidate_bucket_check(settings.S3_BUCKET)
         logger.error(f"Error uploading file object to S3: {str(e)}")
         raise Exception(f"Error uploading file object: {e}")
 
+def upload_bytes_to_s3(data: bytes | BytesIO, s3_key: str, content_type: str = None) -> str:
+    """
+    Upload an in-memory buffer to S3 with a single PutObject and return the URL.
+    Meant for generated artifacts (reports) that never need to touch disk.
+    """
+    body = data.getvalue() if isinstance(data, BytesIO) else data
+    try:
+        logger.info(f"Uploading {len(body)} bytes to S3 bucket {settings.S3_BUCKET} with key {s3_key}")
+        s3 = get_s3()
+
+        # Ensure bucket exists before uploading (cached after the first check)
+        ensure_bucket_ready(s3, settings.S3_BUCKET)
+
+        extra_args = {}
+        if content_type:
+            extra_args['ContentType'] = content_type
+
+        s3.put_object(Bucket=settings.S3_BUCKET, Key=s3_key, Body=body, **extra_args)
+        logger.info(f"Successfully uploaded buffer to S3: {s3_key}")
+
+        # Generate and return the S3 URL
+        return generate_s3_url(s3_key)
+
+    except Exception as e:
+        if is_no_such_bucket_error(e):
+            invalidate_bucket_check(settings.S3_BUCKET)
+        logger.error(f"Error uploading buffer to S3: {str(e)}")
+        raise Exception(f"Error uploading buffer: {e}")
+
 def delete_s3_object(s3_key: str) -> bool:
     """Delete an object from S3"""
     try:
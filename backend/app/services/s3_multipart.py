@@ -0,0 +1,222 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+import logging
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.jobs import job_handler
+from app.services.s3 import (
+    get_s3,
+    generate_s3_url,
+    ensure_bucket_ready,
+    is_bucket_verified,
+    invalidate_bucket_check,
+    is_no_such_bucket_error,
+)
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects multipart parts smaller than 5 MiB (only the last part may be smaller)
+MIN_PART_SIZE = 5 * 1024 * 1024
+# S3 allows at most 10,000 parts per multipart upload
+MAX_PARTS = 10000
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_s3_executor() -> ThreadPoolExecutor:
+    """Get the dedicated thread pool used for blocking boto3 calls"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.S3_UPLOAD_WORKERS,
+            thread_name_prefix="s3-upload",
+        )
+    return _executor
+
+def shutdown_s3_executor() -> None:
+    """Stop the S3 thread pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def run_in_s3_executor(func, *args, **kwargs):
+    """Run a blocking S3 call on the dedicated executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_s3_executor(), partial(func, *args, **kwargs))
+
+async def ensure_bucket_ready_async() -> None:
+    """Verify the bucket on the S3 executor unless a recent check is cached"""
+    if not is_bucket_verified(settings.S3_BUCKET):
+        await run_in_s3_executor(ensure_bucket_ready, get_s3(), settings.S3_BUCKET)
+
+async def verify_bucket_on_startup() -> None:
+    """Warm the bucket check at startup so the first upload skips it"""
+    if not settings.S3_BUCKET:
+        return
+    try:
+        await ensure_bucket_ready_async()
+        logger.info(f"Verified S3 bucket '{settings.S3_BUCKET}' at startup")
+    except Exception as e:
+        logger.warning(f"Could not verify S3 bucket at startup: {str(e)}")
+
+def multipart_part_size() -> int:
+    """Configured multipart part size, clamped to the S3 minimum"""
+    return max(settings.S3_MULTIPART_CHUNK_SIZE, MIN_PART_SIZE)
+
+def _extra_args(content_type: Optional[str], metadata: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    extra_args: Dict[str, Any] = {}
+    if content_type:
+        extra_args["ContentType"] = content_type
+    if metadata:
+        extra_args["Metadata"] = metadata
+    return extra_args
+
+async def create_multipart_upload(
+    s3_key: str,
+    content_type: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> str:
+    """Start a multipart upload and return its UploadId"""
+    s3 = get_s3()
+    response = await run_in_s3_executor(
+        s3.create_multipart_upload,
+        Bucket=settings.S3_BUCKET,
+        Key=s3_key,
+        **_extra_args(content_type, metadata),
+    )
+    logger.info(f"Started multipart upload for {s3_key}: {response['UploadId']}")
+    return response["UploadId"]
+
+async def upload_part(s3_key: str, upload_id: str, part_number: int, data: bytes) -> str:
+    """Upload a single part and return its ETag"""
+    s3 = get_s3()
+    response = await run_in_s3_executor(
+        s3.upload_part,
+        Bucket=settings.S3_BUCKET,
+        Key=s3_key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        Body=data,
+    )
+    return response["ETag"]
+
+async def complete_multipart_upload(s3_key: str, upload_id: str, parts: List[Dict[str, Any]]) -> None:
+    """Complete a multipart upload from a list of {"PartNumber", "ETag"} dicts"""
+    s3 = get_s3()
+    await run_in_s3_executor(
+        s3.complete_multipart_upload,
+        Bucket=settings.S3_BUCKET,
+        Key=s3_key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+    )
+    logger.info(f"Completed multipart upload for {s3_key} ({len(parts)} parts)")
+
+async def abort_multipart_upload(s3_key: str, upload_id: str) -> None:
+    """Abort a multipart upload so S3 discards the stored parts"""
+    try:
+        s3 = get_s3()
+        await run_in_s3_executor(
+            s3.abort_multipart_upload,
+            Bucket=settings.S3_BUCKET,
+            Key=s3_key,
+            UploadId=upload_id,
+        )
+        logger.info(f"Aborted multipart upload for {s3_key}: {upload_id}")
+    except Exception as e:
+        logger.warning(f"Failed to abort multipart upload {upload_id} for {s3_key}: {str(e)}")
+
+def _raise_if_failed(tasks: List[asyncio.Task]) -> None:
+    for task in tasks:
+        if task.done() and not task.cancelled() and task.exception():
+            raise task.exception()
+
+async def stream_upload_to_s3(
+    upload: UploadFile,
+    s3_key: str,
+    content_type: Optional[str] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Stream an UploadFile to S3 and return the object URL.
+
+    The file is read one part at a time and each part is pushed with
+    upload_part on the S3 executor. At most S3_UPLOAD_CONCURRENCY parts are
+    in flight, so memory use is bounded by concurrency * part size no matter
+    how large the upload is. Files smaller than one part use a single PutObject.
+    """
+    if not settings.S3_BUCKET:
+        raise ValueError("S3 bucket not configured")
+
+    await ensure_bucket_ready_async()
+
+    try:
+        return await _stream_upload(upload, s3_key, content_type, metadata)
+    except Exception as e:
+        if is_no_such_bucket_error(e):
+            invalidate_bucket_check(settings.S3_BUCKET)
+        raise
+
+async def _stream_upload(
+    upload: UploadFile,
+    s3_key: str,
+    content_type: Optional[str],
+    metadata: Optional[Dict[str, str]],
+) -> str:
+    part_size = multipart_part_size()
+    first_chunk = await upload.read(part_size)
+
+    if len(first_chunk) < part_size:
+        s3 = get_s3()
+        await run_in_s3_executor(
+            s3.put_object,
+            Bucket=settings.S3_BUCKET,
+            Key=s3_key,
+            Body=first_chunk,
+            **_extra_args(content_type, metadata),
+        )
+        logger.info(f"Uploaded {s3_key} with a single PutObject ({len(first_chunk)} bytes)")
+        return generate_s3_url(s3_key)
+
+    upload_id = await create_multipart_upload(s3_key, content_type, metadata)
+    semaphore = asyncio.Semaphore(settings.S3_UPLOAD_CONCURRENCY)
+    tasks: List[asyncio.Task] = []
+
+    async def send_part(part_number: int, data: bytes) -> Dict[str, Any]:
+        try:
+            etag = await upload_part(s3_key, upload_id, part_number, data)
+            return {"PartNumber": part_number, "ETag": etag}
+        finally:
+            semaphore.release()
+
+    try:
+        part_number = 1
+        chunk = first_chunk
+        while chunk:
+            await semaphore.acquire()
+            _raise_if_failed(tasks)
+            tasks.append(asyncio.create_task(send_part(part_number, chunk)))
+            part_number += 1
+            chunk = await upload.read(part_size)
+
+        parts = await asyncio.gather(*tasks)
+        await complete_multipart_upload(s3_key, upload_id, parts)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await abort_multipart_upload(s3_key, upload_id)
+        raise
+
+    return generate_s3_url(s3_key)
+
+@job_handler("s3.delete_object")
+async def delete_object_job(session, payload: Dict[str, Any], ctx) -> Dict[str, Any]:
+    """Background job: delete one object; a missing object counts as deleted"""
+    s3 = get_s3()
+    await run_in_s3_executor(s3.delete_object, Bucket=payload.get("bucket") or settings.S3_BUCKET, Key=payload["key"])
+    return {"deleted": payload["key"]}
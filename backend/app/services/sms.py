@@ -0,0 +1,159 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+import os
+import threading
+
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from twilio.rest import Client
+
+from app.core.config import settings
+from app.db.models import SmsMessage
+from app.db.session import AsyncSessionLocal
+from app.services.background import start_background_task
+
+logger = logging.getLogger(__name__)
+
+_twilio_client: Optional[Client] = None
+_twilio_client_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=settings.SMS_CONCURRENCY, thread_name_prefix="sms")
+_wakeup: Optional[asyncio.Event] = None
+
+def get_twilio_client() -> Optional[Client]:
+    """Get the shared Twilio client (None when Twilio isn't configured)"""
+    global _twilio_client
+    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+    if not (account_sid and auth_token):
+        return None
+    if _twilio_client is None:
+        with _twilio_client_lock:
+            if _twilio_client is None:
+                _twilio_client = Client(account_sid, auth_token)
+    return _twilio_client
+
+def twilio_configured() -> bool:
+    return bool(os.getenv("TWILIO_ACCOUNT_SID") and os.getenv("TWILIO_AUTH_TOKEN"))
+
+async def enqueue_sms(
+    session: AsyncSession,
+    to_number: str,
+    body: str,
+    claim_id: Optional[int] = None,
+) -> int:
+    """
+    Queue an SMS for delivery and return its id.
+
+    The row is committed here so the dispatcher (possibly on another replica)
+    can see it straight away.
+    """
+    message = SmsMessage(to_number=to_number, body=body, claim_id=claim_id, status="queued")
+    session.add(message)
+    await session.commit()
+    if _wakeup is not None:
+        _wakeup.set()
+    return message.id
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.SMS_RETRY_BASE_DELAY * (2 ** (attempts - 1)))
+
+async def _claim_due_messages() -> list[SmsMessage]:
+    """Move due messages to 'sending'; a conditional UPDATE keeps replicas from sending twice"""
+    now = datetime.utcnow()
+    stuck_before = now - timedelta(seconds=settings.SMS_SENDING_TIMEOUT)
+    claimed = []
+    async with AsyncSessionLocal() as session:
+        due = or_(
+            and_(SmsMessage.status == "queued", SmsMessage.next_attempt_at <= now),
+            # A worker died mid-send; try again
+            and_(SmsMessage.status == "sending", SmsMessage.updated_at < stuck_before),
+        )
+        result = await session.execute(
+            select(SmsMessage).where(due).order_by(SmsMessage.id).limit(settings.SMS_BATCH_SIZE)
+        )
+        for message in result.scalars().all():
+            updated = await session.execute(
+                update(SmsMessage)
+                .where(
+                    SmsMessage.id == message.id,
+                    SmsMessage.status == message.status,
+                    # Reclaiming a stuck row leaves it 'sending'; attempts tells the claims apart
+                    SmsMessage.attempts == message.attempts,
+                )
+                .values(status="sending", attempts=SmsMessage.attempts + 1)
+            )
+            if updated.rowcount == 1:
+                claimed.append(message.id)
+        await session.commit()
+
+        if not claimed:
+            return []
+        result = await session.execute(select(SmsMessage).where(SmsMessage.id.in_(claimed)))
+        return list(result.scalars().all())
+
+async def _deliver(message: SmsMessage) -> None:
+    client = get_twilio_client()
+    values = {}
+    try:
+        if client is None:
+            raise RuntimeError("Twilio not configured")
+        twilio_phone = os.getenv("TWILIO_PHONE_NUMBER", "+1234567890")
+        loop = asyncio.get_running_loop()
+        sent = await loop.run_in_executor(
+            _executor,
+            lambda: client.messages.create(body=message.body, from_=twilio_phone, to=message.to_number),
+        )
+        values = {"status": "sent", "twilio_sid": sent.sid, "sent_at": datetime.utcnow(), "last_error": None}
+        logger.info(f"SMS {message.id} sent: {sent.sid}")
+    except Exception as e:
+        if message.attempts >= settings.SMS_MAX_ATTEMPTS or client is None:
+            values = {"status": "failed", "last_error": str(e)}
+            logger.error(f"SMS {message.id} failed permanently: {str(e)}")
+        else:
+            values = {
+                "status": "queued",
+                "last_error": str(e),
+                "next_attempt_at": datetime.utcnow() + _backoff(message.attempts),
+            }
+            logger.warning(f"SMS {message.id} attempt {message.attempts} failed, will retry: {str(e)}")
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(SmsMessage).where(SmsMessage.id == message.id).values(**values))
+        await session.commit()
+
+async def dispatch_due_sms() -> int:
+    """Send one batch of due messages with at most SMS_CONCURRENCY in flight"""
+    messages = await _claim_due_messages()
+    if messages:
+        await asyncio.gather(*(_deliver(m) for m in messages))
+    return len(messages)
+
+async def _run_dispatcher() -> None:
+    while True:
+        try:
+            sent = await dispatch_due_sms()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"SMS dispatcher failed: {str(e)}")
+            sent = 0
+        if sent:
+            # A full batch may mean more is waiting
+            continue
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.SMS_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+def start_sms_dispatcher() -> None:
+    """Start the outbound SMS dispatcher (called on application startup)"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    start_background_task("sms-dispatcher", _run_dispatcher())
+
+def shutdown_sms_executor() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import FormSubmission, ReportWatermark
+from app.services.email_outbox import enqueue_email
+from app.services.emailer import should_link_attachment, link_expiry_text
+from app.services.jobs import job_handler, PermanentJobError
+from app.services.pdf_executor import render_submissions_pdf
+from app.services.s3 import upload_bytes_to_s3, generate_presigned_url, s3_key_for_recording
+from app.services.s3_multipart import run_in_s3_executor
+
+logger = logging.getLogger(__name__)
+
+# Watermark names of the incremental submissions reports
+WATERMARK_EMAIL = "submissions_email"
+WATERMARK_PDF = "submissions_pdf"
+
+def submission_row(x: FormSubmission) -> Dict[str, Any]:
+    """Flatten a form submission for the submissions PDF"""
+    return {
+        "id": x.id,
+        "full_name": x.full_name,
+        "email": x.email,
+        "notes": x.notes,
+        "latitude": x.latitude,
+        "longitude": x.longitude,
+        "geo_accuracy_m": x.geo_accuracy_m,
+        "captured_at": x.captured_at.isoformat(),
+    }
+
+def _naive_utc(value: datetime) -> datetime:
+    """captured_at is naive UTC; convert client timestamps with an offset to match"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def submission_filters(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+) -> list:
+    """WHERE clauses for a captured_at range and/or rows after a watermark id"""
+    filters = []
+    if since is not None:
+        filters.append(FormSubmission.captured_at >= _naive_utc(since))
+    if until is not None:
+        filters.append(FormSubmission.captured_at < _naive_utc(until))
+    if after_id:
+        filters.append(FormSubmission.id > after_id)
+    return filters
+
+async def fetch_submission_rows(
+    session: AsyncSession,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    result = await session.execute(
+        select(FormSubmission)
+        .where(*submission_filters(since, until, after_id))
+        .order_by(FormSubmission.id)
+    )
+    return [submission_row(x) for x in result.scalars().all()]
+
+def incremental_cutoff() -> datetime:
+    """
+    Upper captured_at bound for incremental reports.
+
+    The watermark is a SERIAL id, and ids are handed out at insert time, not
+    at commit. A slow transaction can therefore commit id N after N+1 is
+    already visible, and a watermark at N+1 would skip it for good. Leaving
+    the last REPORT_WATERMARK_LAG seconds of submissions for the next run
+    gives such transactions time to commit.
+    """
+    return datetime.utcnow() - timedelta(seconds=settings.REPORT_WATERMARK_LAG)
+
+async def get_watermark(session: AsyncSession, name: str) -> ReportWatermark:
+    """Load an incremental report's watermark, creating it (at 0) on first use"""
+    watermark = await session.get(ReportWatermark, name)
+    if watermark is None:
+        watermark = ReportWatermark(name=name, last_id=0)
+        session.add(watermark)
+        await session.flush()
+    return watermark
+
+async def advance_watermark(
+    session: AsyncSession,
+    name: str,
+    previous_id: int,
+    rows: List[Dict[str, Any]],
+) -> None:
+    """
+    Move the watermark past the reported rows. The caller commits.
+
+    Compare-and-set on the previous id, so two overlapping runs can't both
+    report the same submissions; the loser raises and nothing is committed.
+    """
+    last = rows[-1]
+    result = await session.execute(
+        update(ReportWatermark)
+        .where(ReportWatermark.name == name, ReportWatermark.last_id == previous_id)
+        .values(last_id=last["id"], last_captured_at=datetime.fromisoformat(last["captured_at"]))
+    )
+    if result.rowcount != 1:
+        raise RuntimeError(f"Watermark '{name}' moved during the run")
+
+async def acknowledge_watermark(session: AsyncSession, name: str, last_id: int) -> ReportWatermark:
+    """
+    Move the watermark up to a submission the client confirmed it received.
+    The caller commits. Never moves backwards, so a repeated ack is harmless.
+    """
+    submission = await session.get(FormSubmission, last_id)
+    if submission is None:
+        raise ValueError(f"Submission {last_id} does not exist")
+    watermark = await get_watermark(session, name)
+    await session.execute(
+        update(ReportWatermark)
+        .where(ReportWatermark.name == name, ReportWatermark.last_id < last_id)
+        .values(last_id=last_id, last_captured_at=submission.captured_at)
+    )
+    await session.refresh(watermark)
+    return watermark
+
+@job_handler("submissions_email")
+async def send_submissions_report_job(session: AsyncSession, payload: Dict[str, Any], ctx) -> Dict[str, Any]:
+    """Background job: render the submissions report and queue it for email"""
+    since = datetime.fromisoformat(payload["since"]) if payload.get("since") else None
+    until = datetime.fromisoformat(payload["until"]) if payload.get("until") else None
+    incremental = payload.get("incremental", False)
+    if incremental and (since or until):
+        raise PermanentJobError("incremental cannot be combined with since/until")
+
+    previous_id = 0
+    if incremental:
+        previous_id = (await get_watermark(session, WATERMARK_EMAIL)).last_id
+        until = incremental_cutoff()
+    rows = await fetch_submission_rows(session, since, until, after_id=previous_id)
+    # Persists a newly created watermark and frees the connection while rendering
+    await session.commit()
+    await ctx.set_progress(20)
+
+    if incremental and not rows:
+        logger.info("No new submissions since the last incremental report")
+        return {"submissions": 0, "skipped": True}
+
+    pdf_bytes = await render_submissions_pdf(rows)
+    await ctx.set_progress(60)
+
+    to_address: Optional[str] = payload.get("to") or settings.EMAIL_TO
+    if not to_address:
+        raise PermanentJobError("No recipient: pass 'to' or set EMAIL_TO")
+
+    # Large reports are linked (presigned, time-limited) rather than attached
+    report_url = None
+    if should_link_attachment(len(pdf_bytes)):
+        try:
+            s3_key = s3_key_for_recording("submissions.pdf")
+            await run_in_s3_executor(upload_bytes_to_s3, pdf_bytes, s3_key, "application/pdf")
+            report_url = await run_in_s3_executor(generate_presigned_url, s3_key, settings.EMAIL_LINK_EXPIRY)
+        except Exception as e:
+            logger.warning(f"Failed to upload submissions report for linking, attaching instead: {str(e)}")
+
+    if report_url:
+        text_body = f"Download the report (link expires in {link_expiry_text()}):\n{report_url}"
+    else:
+        text_body = "Please find the attached report."
+    if incremental:
+        # Committed together with the outbox row by enqueue_email
+        await advance_watermark(session, WATERMARK_EMAIL, previous_id, rows)
+    message_id = await enqueue_email(
+        session,
+        to_address=to_address,
+        subject="Form Submissions Report",
+        text_body=text_body,
+        attachment=None if report_url else pdf_bytes,
+        attachment_name="submissions.pdf",
+    )
+    logger.info(f"Submissions report ({len(rows)} rows) queued as email {message_id}")
+    return {
+        "submissions": len(rows),
+        "to": to_address,
+        "email_message_id": message_id,
+        "email_delivery": "link" if report_url else "attachment",
+        "first_id": rows[0]["id"] if rows else None,
+        "last_id": rows[-1]["id"] if rows else None,
+    }
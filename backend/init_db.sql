@@ -57,6 +57,9 @@ CREATE TABLE IF NOT EXISTS recordings (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX IF NOT EXISTS ix_meetings_claim_id ON meetings (claim_id);
+CREATE INDEX IF NOT EXISTS ix_recordings_meeting_id ON recordings (meeting_id);
+
 CREATE TABLE IF NOT EXISTS geolocations (
     id SERIAL PRIMARY KEY,
     claim_id INTEGER REFERENCES claims(id) NOT NULL,
@@ -67,3 +70,108 @@ CREATE TABLE IF NOT EXISTS geolocations (
     source VARCHAR(50) DEFAULT 'manual',
     geo_metadata TEXT
 );
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id VARCHAR(36) PRIMARY KEY,
+    meeting_id INTEGER REFERENCES meetings(id) NOT NULL,
+    kind VARCHAR(20) DEFAULT 'resumable',
+    s3_key VARCHAR(512) NOT NULL,
+    upload_id VARCHAR(1024) NOT NULL,
+    mime_type VARCHAR(120) NOT NULL,
+    part_size INTEGER NOT NULL,
+    total_size BIGINT,
+    status VARCHAR(20) DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS upload_parts (
+    id SERIAL PRIMARY KEY,
+    upload_session_id VARCHAR(36) REFERENCES upload_sessions(id) NOT NULL,
+    part_number INTEGER NOT NULL,
+    etag VARCHAR(255) NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (upload_session_id, part_number)
+);
+
+CREATE TABLE IF NOT EXISTS upload_segments (
+    id SERIAL PRIMARY KEY,
+    upload_session_id VARCHAR(36) REFERENCES upload_sessions(id) NOT NULL,
+    seq INTEGER NOT NULL,
+    data BYTEA NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (upload_session_id, seq)
+);
+
+CREATE INDEX IF NOT EXISTS ix_upload_segments_upload_session_id ON upload_segments (upload_session_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_upload_sessions_live_meeting
+    ON upload_sessions (meeting_id) WHERE kind = 'live' AND status = 'active';
+
+CREATE TABLE IF NOT EXISTS sms_messages (
+    id SERIAL PRIMARY KEY,
+    to_number VARCHAR(20) NOT NULL,
+    body TEXT NOT NULL,
+    claim_id INTEGER REFERENCES claims(id),
+    status VARCHAR(20) DEFAULT 'queued',
+    attempts INTEGER DEFAULT 0,
+    twilio_sid VARCHAR(64),
+    last_error TEXT,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id SERIAL PRIMARY KEY,
+    to_address VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    text_body TEXT NOT NULL,
+    html_body TEXT,
+    attachment BYTEA,
+    attachment_name VARCHAR(255),
+    kind VARCHAR(30) DEFAULT 'message',
+    status VARCHAR(20) DEFAULT 'queued',
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    digest_id INTEGER,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_email_outbox_status_next_attempt ON email_outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_to_address ON email_outbox (to_address);
+
+CREATE TABLE IF NOT EXISTS report_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    last_id INTEGER DEFAULT 0,
+    last_captured_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_form_submissions_captured_at ON form_submissions (captured_at);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    payload TEXT NOT NULL,
+    status VARCHAR(20) DEFAULT 'queued',
+    progress INTEGER DEFAULT 0,
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 3,
+    result TEXT,
+    last_error TEXT,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100),
+    locked_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_status_run_after ON jobs (status, run_after);
@@ -11,10 +11,20 @@ from dotenv import load_dotenv
 from app.core.config import settings
 from app.db.session import get_session, engine
 from app.db.models import Base
-from app.api.routers import forms, meetings, recordings, claims, s3, jaas
+from app.api.routers import forms, meetings, recordings, claims, s3, jaas, jobs
 
 # Import authentication modules
 from app.auth import router as auth_router
+from app.services.s3_multipart import shutdown_s3_executor, verify_bucket_on_startup
+from app.services.background import start_background_task, stop_background_tasks
+from app.services.resumable_uploads import start_upload_sweeper
+from app.services.room_pool import start_room_pool
+from app.services.sms import start_sms_dispatcher, shutdown_sms_executor
+from app.services.jobs import start_job_workers
+from app.services.pdf_executor import warm_pdf_executor, shutdown_pdf_executor, pdf_render_stats
+from app.services.emailer import shutdown_smtp_pool
+from app.services.email_outbox import start_email_dispatcher
+from app.services.passwords import shutdown_password_executor, hashing_stats
 
 # Load environment variables
 load_dotenv()
@@ -41,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Report-Last-Id"],  # incremental submissions report
 )
 
 # Include routers
@@ -51,6 +62,7 @@ app.include_router(meetings.router, prefix="/api")
 app.include_router(recordings.router, prefix="/api")
 app.include_router(s3.router, prefix="/api")
 app.include_router(jaas.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
 
 # Health check endpoint
 @app.get("/api/health")
@@ -58,7 +70,9 @@ async def health_check():
     return {
         "status": "OK",
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "message": "VerifyCall API is running"
+        "message": "VerifyCall API is running",
+        "password_hashing": hashing_stats(),
+        "pdf_rendering": pdf_render_stats()
     }
 
 # Root endpoint
@@ -80,6 +94,25 @@ async def http_exception_handler(request, exc):
 #     async with engine.begin() as conn:
 #         await conn.run_sync(Base.metadata.create_all)
 
+@app.on_event("startup")
+async def startup():
+    await verify_bucket_on_startup()
+    start_upload_sweeper()
+    start_room_pool()
+    start_sms_dispatcher()
+    start_job_workers()
+    start_email_dispatcher()
+    start_background_task("pdf-pool-warmup", warm_pdf_executor())
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_background_tasks()
+    shutdown_s3_executor()
+    shutdown_password_executor()
+    shutdown_sms_executor()
+    shutdown_pdf_executor()
+    shutdown_smtp_pool()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from app.services.submissions import submission_filters
+
+def test_aware_range_is_compared_as_naive_utc():
+    since, until = submission_filters(
+        since=datetime.fromisoformat("2025-03-01T12:00:00+02:00"),
+        until=datetime.fromisoformat("2025-03-02T00:00:00Z"),
+    )
+    assert since.right.value == datetime(2025, 3, 1, 10, 0)
+    assert until.right.value == datetime(2025, 3, 2, 0, 0)
+
+def test_naive_range_is_left_alone():
+    (since,) = submission_filters(since=datetime(2025, 3, 1, 12, 0))
+    assert since.right.value == datetime(2025, 3, 1, 12, 0)
@@ -3,6 +3,10 @@ import { useParams } from 'react-router-dom';
 import { Video, Phone, FileText, Eye, Check, ChevronRight, ExternalLink, Send, Copy, MapPin, Link2, Mail, AlertCircle, CheckCircle } from 'lucide-react';
 import { claimsAPI, videoCallAPI, formsAPI, smsAPI, s3API } from '../services/api';
 
+// Report job polling: every 2s, giving up after 5 minutes
+const REPORT_POLL_INTERVAL_MS = 2000;
+const REPORT_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
 const MultiStepForm = () => {
   const { id } = useParams<{ id: string }>();
   const [currentStep, setCurrentStep] = useState(1);
@@ -363,12 +367,33 @@ const generateMeetingLinks = async () => {
 
       const response = await formsAPI.generateReport(reportData);
 
-      if (response.success) {
+      if (!response.success) {
+        setReportStatus('error');
+        setReportMessage(response.message || 'Failed to generate report');
+        return;
+      }
+
+      // The report is built in the background; poll until it finishes or we give up
+      const pollDeadline = Date.now() + REPORT_POLL_TIMEOUT_MS;
+      let report = await formsAPI.getReportStatus(response.job_id);
+      while (report.status === 'queued' || report.status === 'running') {
+        if (Date.now() >= pollDeadline) {
+          setReportStatus('error');
+          setReportMessage('Report generation is taking longer than expected. Please check back later or try again.');
+          return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, REPORT_POLL_INTERVAL_MS));
+        report = await formsAPI.getReportStatus(response.job_id);
+      }
+
+      if (report.status === 'succeeded' && report.email_message_id && report.email_status !== 'dead') {
         setReportStatus('success');
-        setReportMessage('PDF report generated and emailed successfully!');
+        setReportMessage(report.email_sent
+          ? 'PDF report generated and emailed successfully!'
+          : 'PDF report generated and queued for email delivery.');
       } else {
         setReportStatus('error');
-        setReportMessage(response.message || 'Failed to generate report');
+        setReportMessage(report.email_error || report.error || 'Failed to generate report');
       }
     } catch (error) {
       console.error('Error generating report:', error);
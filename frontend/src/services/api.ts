@@ -134,6 +134,7 @@ export interface VideoCallResponse {
   moderatorToken?: string;
   patientToken?: string;
   smsSent: boolean;
+  smsMessageId?: number;
   message: string;
 }
 
@@ -288,12 +289,12 @@ export const smsAPI = {
   send: async (phoneNumber: string, message: string, claimId?: string): Promise<{
     success: boolean;
     message: string;
-    message_id?: string;
+    message_id?: number;
   }> => {
     const response = await api.post<{
       success: boolean;
       message: string;
-      message_id?: string;
+      message_id?: number;
     }>('/meetings/send-sms', {
       phone_number: phoneNumber,
       message: message,
@@ -316,6 +317,21 @@ export const getJitsiToken = async (
   throw new Error('Jitsi token endpoint not implemented. Use videoCallAPI.create instead.');
 };
 
+export interface ReportJobStatus {
+  job_id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  progress: number;
+  error?: string;
+  claim_number?: string;
+  s3_url?: string;
+  email_message_id?: number;
+  email_status?: 'queued' | 'sending' | 'sent' | 'dead' | null;
+  email_sent?: boolean;
+  email_error?: string;
+  recipient_email?: string;
+  verification_status?: string;
+}
+
 // Forms API
 export const formsAPI = {
   submit: async (formData: FormSubmissionRequest): Promise<{
@@ -335,29 +351,24 @@ export const formsAPI = {
 
   generateReport: async (request: ReportGenerationRequest): Promise<{
     success: boolean;
-    claim_number: string;
-    report_generated: boolean;
-    email_sent: boolean;
-    pdf_file_path: string;
-    s3_url?: string;
-    recipient_email: string;
-    verification_status: string;
+    job_id: string;
+    status: string;
     message: string;
   }> => {
     const response = await api.post<{
       success: boolean;
-      claim_number: string;
-      report_generated: boolean;
-      email_sent: boolean;
-      pdf_file_path: string;
-      s3_url?: string;
-      recipient_email: string;
-      verification_status: string;
+      job_id: string;
+      status: string;
       message: string;
     }>('/forms/generate-report', request);
     return response.data;
   },
 
+  getReportStatus: async (jobId: string): Promise<ReportJobStatus> => {
+    const response = await api.get<ReportJobStatus>(`/forms/reports/${jobId}`);
+    return response.data;
+  },
+
   getClaimSummary: async (claimId: number): Promise<{
     success: boolean;
     claim: Claim;